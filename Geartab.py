@@ -7,6 +7,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from gpkit import units
 from mission import Mission
+from solvers import get_solver
 import numpy as np
 class GearTab(QWidget):
     def __init__(self):
@@ -70,7 +71,7 @@ class GearTab(QWidget):
                     M.substitutions.update({var: parsed * unit})
                     self.user_inputs[key] = parsed
 
-            sol = M.localsolve('cvxopt')
+            sol = M.localsolve(get_solver())
 
             self.summary_box.setText(self.build_summary(gear, sol))
             #self.plot_gear_structure(gear, sol)
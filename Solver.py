@@ -2,6 +2,8 @@ import gpkit
 from gpkit import Model, parse_variables, Vectorize, SignomialEquality,Variable,units
 from mission import *
 from solwriter import *
+from solvers import get_solver
+from concurrent.futures import ProcessPoolExecutor
 import math
 import numpy as np
 import matplotlib.pyplot as plt
@@ -10,60 +12,49 @@ pi = math.pi
 #from sens_chart import *
 
 
-def RegularSolve():
-#for blownwing
-    M = Mission(wingmode ='blownwing')
-    M.cost =1/M.R
-    sol = M.localsolve(solver='cvxopt')
-    # M.substitutions.update({M.aircraft.bw.wing.planform.S:134.22})
-    #sd = get_highestsens(M, sol, N=10)
-    #f, a = plot_chart(sd)
-    #f.savefig("sensbar.pdf", bbox_inches="tight")
-    print (sol(M.R))
-    print (sol(M.aircraft.mass))
-    print (sol(M.cruise.perf.P))
-    print(sol(M.loading.wingl.w))
-    #print(M.aircraft)
-    print(sol(M.CLmax))
-    #print (sol["sensitivities"]["constants"]["CLCmax"])
-    writeSolBW(sol)
-    writePropBW(sol,M)
-    writeWgtBW(sol,M)
-    #for conventional wing
-    M = Mission(wingmode ='na')
-   # M.substitutions.update({M.aircraft.bw.wing.planform.S:134.22})
-   # M.substitutions.update({M.aircraft.bw.wing.planform.AR:8.79})
-   # M.substitutions.update({M.aircraft.bw.wing.planform.b:34.34})
+def SolveMode(wingmode):
+    " solve one wing mode for maximum range; runs in a worker process "
+    M = Mission(wingmode=wingmode)
     M.cost =1/M.R
-    sol = M.localsolve(solver='cvxopt')
-    # print M.program.gps[-1].result.summary()
-    # print sol.summary()
-    #sd = get_highestsens(M, sol, N=10)
-    #f, a = plot_chart(sd)
-    #f.savefig("sensbar.pdf", bbox_inches="tight")
-    print (sol(M.R))
-    print (sol(M.aircraft.mass))
-    print(sol(M.CLmax))
-   # print(sol(M.aircraft.bw.wing.spar.laoding.w))
-    #print(sol(M.AircraftLoading.Sparloading))
-    #print (sol["sensitivities"]["constants"]["CLmax"])
-    writeSolNW(sol)
-    writePropNW(sol,M)
-    writeWgtNW(sol,M)
+    sol = M.localsolve(solver=get_solver())
+    return extract(sol, M)
 
+def CompareSolve(modes=(('blownwing', 'BW'), ('na', 'NW'))):
+    """ solve the wing modes concurrently and write their reports
+
+    Each mode is solved in its own process; the solution table, propulsion
+    table and mass summary are written per mode and a delta report compares
+    the first two.
+    """
+    with ProcessPoolExecutor(len(modes)) as pool:
+        results = list(pool.map(SolveMode, [wingmode for wingmode, _ in modes]))
+    for data, (_, tag) in zip(results, modes):
+        writeSol(data, tag)
+        writeProp(data, tag)
+        writeWgt(data, tag)
+    if len(results) > 1:
+        writeDelta(results[0], results[1], (modes[0][1], modes[1][1]))
+    return results
+
+def RegularSolve():
+#for blownwing and conventional wing
+    for data in CompareSolve():
+        print (data["R"])
+        print (data["masses"][0][1])
+        print (data["CLmax"])
     
 def RangeMassplot():
    M = Mission(wingmode='na')
    Mass_sweep = np.linspace(30000,50000,10)
    M.substitutions.update({M.aircraft.battery.E_capacity:('sweep',Mass_sweep)})
    M.cost = M.aircraft.mass
-   sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+   sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
    #print (sol.summary())
    plt.plot(sol(M.aircraft.mass),sol(M.R),label='Wing')
    M = Mission(wingmode="blownwing")
    M.substitutions.update({M.aircraft.mass:('sweep',Mass_sweep)})
    M.cost =M.aircraft.mass
-   sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+   sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
    plt.plot(sol(M.aircraft.mass),sol(M.R),label='Blown Wing')
    plt.legend()
    plt.title("Mass-range diagram")
@@ -78,14 +69,14 @@ def MassRunway():
     Mass_sweep = np.linspace(50,500,10)
     M.substitutions.update({M.Srunway:('sweep',Mass_sweep)})
     M.cost = M.aircraft.mass
-    sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+    sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
     print (sol(M.aircraft.mass))
     plt.plot(sol(M.Srunway),sol(M.aircraft.mass),label='Wing')
     M = Mission(wingmode="blownwing")
     Mass_sweep = np.linspace(10,200,10)
     M.substitutions.update({M.Srunway:('sweep',Mass_sweep)})
     M.cost =M.aircraft.mass
-    sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+    sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
     plt.plot(sol(M.Srunway),sol(M.aircraft.mass),label='Blown Wing')
     print (sol(M.aircraft.mass))
     plt.legend()
@@ -101,14 +92,14 @@ def Powerusage():
     Mass_sweep = np.linspace(50,500,10)
     M.substitutions.update({M.Srunway:('sweep',Mass_sweep)})
     M.cost = M.aircraft.mass
-    sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+    sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
     print (sol(M.aircraft.dynamic.P))
     plt.plot(sol(M.Srunway),sol(M.aircraft.mass),label='Wing')
     M = Mission(wingmode="blownwing")
     Mass_sweep = np.linspace(10,200,10)
     M.substitutions.update({M.Srunway:('sweep',Mass_sweep)})
     M.cost =M.aircraft.mass
-    sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+    sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
     plt.plot(sol(M.Srunway),sol(M.aircraft.mass),label='Blown Wing')
     print (sol(M.aircraft.mass))
     plt.legend()
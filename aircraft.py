@@ -1,4 +1,5 @@
 import gpkit
+import buildstate  # gpkit's model-building state per thread
 from gpkit import Model, parse_variables, Vectorize, SignomialEquality,Variable,units
 from fusegear import *
 from battm import *
@@ -20,7 +21,7 @@ class Aircraft(Model):
     d                   [in]    spar diam
     """
     @parse_variables(__doc__,globals())
-    def setup(self,wingmode):
+    def setup(self,wingmode,propmap=False,taper=1.,motors=None):
         self.equipment = Equipment()
         self.battery = Battery()
         self.fuselage = Fuselage()
@@ -36,9 +37,9 @@ class Aircraft(Model):
         self.vtail.substitutions[self.vtail.planform.CLmax] = 3
         
         if wingmode =="na":
-         self.bw = NormalWing()
+         self.bw = NormalWing(propmap=propmap,taper=taper,motors=motors)
         elif wingmode =="blownwing":
-         self.bw = BlownWing()
+         self.bw = BlownWing(propmap=propmap,taper=taper,motors=motors)
         else: print("choose between  na or blownwing , invalid input")
 
         self.components = [self.bw,self.fuselage,self.gear,self.equipment,self.battery]
@@ -66,11 +67,11 @@ class Aircraft(Model):
                             self.bw.wing.b - Variable("w_fuse",50,"in") >= self.bw.n_prop*2*self.bw.powertrain.r]
         return constraints, self.components, self.htail, self.vtail, self.boom
     
-    def dynamic(self,state,groundroll=False,powermode=True,wingmode ="blownwing",seg =False):
-        return AircraftP(self,state,groundroll=groundroll,powermode=powermode,wingmode=wingmode,seg=seg)
+    def dynamic(self,state,groundroll=False,powermode=True,wingmode ="blownwing",n_active=None):
+        return AircraftP(self,state,groundroll=groundroll,powermode=powermode,wingmode=wingmode,n_active=n_active)
 
-    def loading(self,state,Wcent,Wh,Wv):
-        return AircraftLoading(self,state)
+    def loading(self,state,Wcent,Wh,Wv,cases=None,cstate=None):
+        return AircraftLoading(self,state,cases=cases,cstate=cstate)
     
 class AircraftP(Model):
     """ AircraftP
@@ -86,10 +87,14 @@ class AircraftP(Model):
     L_D                 [-]     aircraft lift-to-drag ratio
     """
     @parse_variables(__doc__,globals())
-    def setup(self,aircraft,state,groundroll=False,powermode=True,wingmode="blownwing",seg=False):
+    def setup(self,aircraft,state,groundroll=False,powermode=True,wingmode="blownwing",n_active=None):
         self.fuse_perf = aircraft.fuselage.dynamic(state)
 
-        self.bw_perf = aircraft.bw.dynamic(state)
+        # only the blown wing schedules its propellers
+        if n_active is None:
+            self.bw_perf = aircraft.bw.dynamic(state)
+        else:
+            self.bw_perf = aircraft.bw.dynamic(state,n_active=n_active)
         self.batt_perf = aircraft.battery.dynamic(state,powermode)
         self.htail_perf = aircraft.htail.flight_model(aircraft.htail, state)
         self.vtail_perf = aircraft.vtail.flight_model(aircraft.vtail, state)
@@ -105,8 +110,6 @@ class AircraftP(Model):
                     ]
         if wingmode =="blownwing":
          constraints+=[self.bw_perf.C_T >= CD,]
-         if seg ==True:aircraft.bw.substitutions.update({aircraft.bw.n_prop :2})
-         else: aircraft.bw.substitutions.update({aircraft.bw.n_prop :10})
         #If we're not in groundroll, apply lift=weight and fuselage drag
         if groundroll == False:
             constraints += [0.5*self.bw_perf.C_L*state.rho*aircraft.bw.wing["S"]*state.V**2 >= aircraft.mass*g]
@@ -118,13 +121,42 @@ class AircraftP(Model):
     
     
 class AircraftLoading(Model):
-    
-    def setup(self,aircraft,state):
-        self.hbend = aircraft.boom.tailLoad(aircraft.boom,aircraft.htail,state)
-        self.vbend = aircraft.boom.tailLoad(aircraft.boom,aircraft.vtail,state)
-        self.wingl = aircraft.bw.wing.spar.loading(aircraft.bw.wing, state)
-        self.hl = aircraft.htail.spar.loading(aircraft.htail, state)
-        self.vl = aircraft.vtail.spar.loading(aircraft.vtail, state)
-        loading = [self.wingl,self.hbend,self.vbend,self.hl,self.vl]
-        
+    """ structural loading of the wing, tails and tail boom
+
+    The design case uses `state` and the models' own load factors. Extra
+    cases, given as (name, Nmax) with Nmax None for the design case's
+    load factor, load the same spars and boom again in one set of models
+    vectorized over the cases, at the FlightState `cstate` vectorized
+    the same way, so one program sizes the shared structure against
+    every case. Loads enter as magnitudes, so a negative-g case is given
+    by its |n|. The vectorized models are self.extra, and self.cases
+    maps each case's name to its index in them.
+    """
+    def setup(self,aircraft,state,cases=None,cstate=None):
+        def models(st):
+            return {"wingl": aircraft.bw.wing.spar.loading(aircraft.bw.wing, st),
+                    "hbend": aircraft.boom.tailLoad(aircraft.boom,aircraft.htail,st),
+                    "vbend": aircraft.boom.tailLoad(aircraft.boom,aircraft.vtail,st),
+                    "hl": aircraft.htail.spar.loading(aircraft.htail, st),
+                    "vl": aircraft.vtail.spar.loading(aircraft.vtail, st)}
+        design = models(state)
+        self.hbend, self.vbend = design["hbend"], design["vbend"]
+        self.wingl, self.hl, self.vl = design["wingl"], design["hl"], design["vl"]
+        loading = list(design.values())
+        cases = list(cases or [])
+        self.cases = {name: i for i, (name, _) in enumerate(cases)}
+        self.extra = None
+        if cases:
+            with Vectorize(len(cases)):
+                extra = self.extra = models(cstate)
+            Nmax = [n for _, n in cases]
+            for key in ("wingl", "hl", "vl"):
+                case = extra[key]
+                case.substitutions[case.Nmax] = (
+                    lambda c, d=design[key]: [c[d.Nmax] if n is None else n
+                                              for n in Nmax])
+                # every case carries the weights the mission puts on the
+                # design case
+                loading.append(case["W"] == design[key]["W"])
+            loading += list(extra.values()) + [cstate]
         return loading
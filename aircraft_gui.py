@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QTabWidget, QLabel
 )
@@ -84,6 +85,9 @@ class GPkitGUI(QWidget):
 
 
 if __name__ == "__main__":
+    # the diagnostics solve in worker processes, which under spawn (and in
+    # the PyInstaller build) must not start another GUI
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = GPkitGUI()
     window.show()
@@ -5,7 +5,7 @@ a = Analysis(
     ['aircraft_gui.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('motors.csv', '.'), ('cells.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,5 +1,6 @@
 from gpkit import Model, parse_variables, Vectorize, SignomialEquality,Variable,units
 import gpkit
+from motors import MAGICALL, catalogue
 class Powertrain(Model):
     """ Powertrain
     Variables
@@ -18,12 +19,16 @@ class Powertrain(Model):
     P_margin      0.5       [-]             power margin
     """
     @parse_variables(__doc__,globals())
-    def setup(self):
+    def setup(self,motors=None):
+        # motors is a catalogue table to fit the relations below to (see
+        # motors.py, e.g. motors.MOTORS); None uses the built-in magicALL fits
+        self.motors = motors
+        fit = self.fit = catalogue(motors) if motors else MAGICALL
         with gpkit.SignomialsEnabled():
-            constraints = [P_m_sp_cont <= P_margin*(61.8*units("W/kg**2")*m + 6290*units("W/kg")), #magicALL motor fits
-                           P_m_sp_max <= P_margin*(86.2*units("W/kg**2")*m + 7860*units("W/kg")),  #magicALL motor fits
-                           eta/1*units("kg**(0.0134)") <= 0.906*m**(0.0134),
-                           (RPMmax/RPM_margin)*m**(0.201) == 7939*units("rpm*kg**0.201"),
+            constraints = [P_m_sp_cont <= P_margin*fit.specific_power(m),
+                           P_m_sp_max <= P_margin*fit.specific_power(m, peak=True),
+                           eta <= fit.efficiency(m),
+                           RPMmax/RPM_margin == fit.rpm(m),
                            Pmax <= m*P_m_sp_max]
         return constraints
 
@@ -56,8 +61,57 @@ class BatteryP(Model):
     """
     @parse_variables(__doc__,globals())
     def setup(self,batt,state,powermode):
-        if powermode == True:
+        # "thermal" leaves the continuous limit to the pack temperature
+        if powermode == True or powermode == "thermal":
          constraints = [P <= batt.m*batt.P_max_burst*batt.eta_pack,]
         else:
          constraints = [P <= batt.m*batt.P_max_cont*batt.eta_pack, ]
         return constraints
+
+class Thermal(Model):
+    """ motor winding and battery pack temperature rise through the mission
+
+    steps lists the mission's time steps in flight order as (t, P_motor,
+    n_active, P_batt). Each step's losses, (1-eta)*P_motor shared by the
+    n_active running motors and f_loss*P_batt in the pack, heat a lumped
+    heat capacity cooled to ambient, integrated with one backward Euler
+    step per time step,
+
+        c*(dT - dT_prev) + hA*t*dT >= q*t
+
+    which is exact for short bursts and tends to the steady rise q/hA over
+    long segments. The rises are capped at dT_max, so the temperatures set
+    how hard and for how long the motors and pack can be driven.
+
+    Variables
+    ---------
+    c_m         900     [J/(kg*K)]      motor heat capacity
+    hA_m        6       [W/(kg*K)]      motor cooling per unit mass
+    dT_m_max    100     [K]             allowed winding temperature rise
+    c_b         1000    [J/(kg*K)]      pack heat capacity
+    hA_b        0.5     [W/(kg*K)]      pack cooling per unit mass
+    dT_b_max    30      [K]             allowed pack temperature rise
+    f_loss      0.05    [-]             pack heat loss per unit output power
+
+    Variables of length len(steps)
+    ------------------------------
+    q_m                 [W/kg]          motor heat per unit motor mass
+    dT_m                [K]             winding temperature rise
+    q_b                 [W/kg]          pack heat per unit pack mass
+    dT_b                [K]             pack temperature rise
+    """
+    @parse_variables(__doc__,globals())
+    def setup(self,powertrain,battery,steps):
+        m, eta = powertrain.m, powertrain.eta
+        constraints = [dT_m <= dT_m_max, dT_b <= dT_b_max]
+        with gpkit.SignomialsEnabled():
+            for i, (t, P_m, n, P_b) in enumerate(steps):
+                constraints += [q_m[i]*m*n + eta*P_m >= P_m,
+                                q_b[i]*battery.m >= f_loss*P_b]
+                heat_m, heat_b = q_m[i]*t, q_b[i]*t
+                if i:
+                    heat_m += c_m*dT_m[i-1]
+                    heat_b += c_b*dT_b[i-1]
+                constraints += [c_m*dT_m[i] + hA_m*t*dT_m[i] >= heat_m,
+                                c_b*dT_b[i] + hA_b*t*dT_b[i] >= heat_b]
+        return constraints
@@ -1,64 +1,116 @@
-" discretized beam model "
-from gpkit import Model, Variable, Vectorize
-
-#pylint: disable=invalid-name
-
-class Beam(Model):
-    """discretized beam bending model
-
-    Upper Unbounded
-    ---------------
-    EIbar, dbar_tip
-
-    Lower Unbounded
-    ---------------
-    dx, qbar (if not qbarFun)
-
-    """
-    qbarFun = None
-    SbarFun = None
-    MbarFun = None
-
-    def setup(self, N):
-
-        with Vectorize(N-1):
-            EIbar = self.EIbar = Variable("\\bar{EI}", "-",
-                             "normalized YM and moment of inertia")
-            dx = self.dx = Variable("dx", "-", "normalized length of element")
-
-        with Vectorize(N):
-            Sbar = Variable("\\bar{S}", self.SbarFun, "-", "normalized shear")
-            Mbar = Variable("\\bar{M}", self.MbarFun, "-", "normalized moment")
-            th = Variable("\\theta", "-", "deflection slope")
-            dbar = Variable("\\bar{\\delta}", "-", "normalized displacement")
-            self.dbar_tip = dbar[-1]
-
-
-        throot = Variable("\\theta_{root}", 1e-10, "-", "Base angle")
-        dbarroot = Variable("\\bar{\\delta}_{root}", 1e-10, "-",
-                            "Base deflection")
-
-        constraints = []
-        if self.SbarFun is None:
-            with Vectorize(N):
-                qbar = self.qbar = Variable("\\bar{q}", self.qbarFun, "-",
-                                            "normalized loading")
-            Sbartip = Variable("\\bar{S}_{tip}", 1e-10, "-", "Tip loading")
-            constraints.extend([
-                Sbar[:-1] >= Sbar[1:] + 0.5*dx*(qbar[:-1] + qbar[1:]),
-                Sbar[-1] >= Sbartip])
-
-        if self.MbarFun is None:
-            Mbartip = Variable("\\bar{M}_{tip}", 1e-10, "-", "Tip moment")
-            constraints.extend([
-                Mbar[:-1] >= Mbar[1:] + 0.5*dx*(Sbar[:-1] + Sbar[1:]),
-                Mbar[-1] >= Mbartip])
-
-        constraints.extend([
-            th[0] >= throot,
-            th[1:] >= th[:-1] + 0.5*dx*(Mbar[1:] + Mbar[:-1])/EIbar,
-            dbar[0] >= dbarroot,
-            dbar[1:] >= dbar[:-1] + 0.5*dx*(th[1:] + th[:-1]),
-            ])
-
-        return constraints
+" discretized beam model "
+from functools import lru_cache
+import numpy as np
+from gpkit import Model, Variable, Vectorize
+
+#pylint: disable=invalid-name
+
+@lru_cache(maxsize=None)
+def stencil(N):
+    """ node index pairs (inboard, outboard) of the N-1 elements
+
+    Shared read-only by every Beam with N nodes.
+    """
+    inboard, outboard = np.arange(N-1), np.arange(1, N)
+    inboard.flags.writeable = outboard.flags.writeable = False
+    return inboard, outboard
+
+def column(x):
+    """ x with a trailing axis for each enclosing Vectorize
+
+    A structure's node or element array, built outside the Vectorize,
+    then broadcasts against a loading model's (N, ...) variables.
+    """
+    return x.reshape(x.shape + (1,)*len(Vectorize.vectorization))
+
+def _values(v):
+    """ a load's node values as an array, None and functions as given
+
+    gpkit broadcasts an array, but not a list, over an enclosing
+    Vectorize, e.g. a beam loaded in several cases at once.
+    """
+    return v if v is None or callable(v) else np.asarray(v, dtype=float)
+
+class Beam(Model):
+    """discretized beam bending model
+
+    Loads are given per instance: qbar is the distributed load at the N
+    nodes, pbar point loads at the nodes (pbar[-1] at the tip), Sbar and
+    Mbar fix the shear or moment outright. Each is a list of values or
+    a linked function, normalized like the variables below; as in any
+    GP they must be positive, so use 1e-10 for no load. The class
+    attributes qbarFun, SbarFun and MbarFun are only defaults for
+    arguments left as None and should not be changed.
+
+    Upper Unbounded
+    ---------------
+    EIbar, dbar_tip
+
+    Lower Unbounded
+    ---------------
+    dx, qbar (if not qbarFun)
+
+    """
+    qbarFun = None
+    SbarFun = None
+    MbarFun = None
+
+    def setup(self, N, qbar=None, Sbar=None, Mbar=None, pbar=None):
+        # kept on the instance: the docstring's "(if not qbarFun)" is read
+        # from it when the model is verified
+        self.qbarFun = self.qbarFun if qbar is None else qbar
+        self.SbarFun = self.SbarFun if Sbar is None else Sbar
+        self.MbarFun = self.MbarFun if Mbar is None else Mbar
+        qbarFun, SbarFun, MbarFun, pbar = map(_values, (
+            self.qbarFun, self.SbarFun, self.MbarFun, pbar))
+        i, o = stencil(N)
+
+        with Vectorize(N-1):
+            EIbar = self.EIbar = Variable("\\bar{EI}", "-",
+                             "normalized YM and moment of inertia")
+            dx = self.dx = Variable("dx", "-", "normalized length of element")
+
+        with Vectorize(N):
+            Sbar = Variable("\\bar{S}", SbarFun, "-", "normalized shear")
+            Mbar = Variable("\\bar{M}", MbarFun, "-", "normalized moment")
+            th = Variable("\\theta", "-", "deflection slope")
+            dbar = Variable("\\bar{\\delta}", "-", "normalized displacement")
+            self.dbar_tip = dbar[-1]
+
+
+        throot = Variable("\\theta_{root}", 1e-10, "-", "Base angle")
+        dbarroot = Variable("\\bar{\\delta}_{root}", 1e-10, "-",
+                            "Base deflection")
+
+        constraints = []
+        if SbarFun is None:
+            with Vectorize(N):
+                qbar = self.qbar = Variable("\\bar{q}", qbarFun, "-",
+                                            "normalized loading")
+            Sbartip = Variable("\\bar{S}_{tip}", 1e-10, "-", "Tip loading")
+            if pbar is None:
+                constraints.extend([
+                    Sbar[i] >= Sbar[o] + 0.5*dx*(qbar[i] + qbar[o]),
+                    Sbar[-1] >= Sbartip])
+            else:
+                with Vectorize(N):
+                    pbar = self.pbar = Variable("\\bar{P}", pbar, "-",
+                                                "normalized point load")
+                constraints.extend([
+                    Sbar[i] >= Sbar[o] + 0.5*dx*(qbar[i] + qbar[o]) + pbar[i],
+                    Sbar[-1] >= Sbartip + pbar[-1]])
+
+        if MbarFun is None:
+            Mbartip = Variable("\\bar{M}_{tip}", 1e-10, "-", "Tip moment")
+            constraints.extend([
+                Mbar[i] >= Mbar[o] + 0.5*dx*(Sbar[i] + Sbar[o]),
+                Mbar[-1] >= Mbartip])
+
+        constraints.extend([
+            th[0] >= throot,
+            th[o] >= th[i] + 0.5*dx*(Mbar[o] + Mbar[i])/EIbar,
+            dbar[0] >= dbarroot,
+            dbar[o] >= dbar[i] + 0.5*dx*(th[o] + th[i]),
+            ])
+
+        return constraints
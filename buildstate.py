@@ -0,0 +1,75 @@
+" per-thread gpkit model-building state, so Missions can be built in threads "
+import threading
+from collections import defaultdict
+from gpkit.globals import NamedVariables, Vectorize, SignomialsEnabled
+
+#pylint: disable=invalid-name,protected-access
+
+# gpkit 1.0 keeps the model lineage, the variables created in it, the
+# vectorization shape and the signomial flag as class attributes, so two
+# models set up at once in different threads name and shape each other's
+# variables. install() replaces each with a descriptor reading the calling
+# thread's own value. Model numbers stay process-wide, under a lock, so
+# models built in different threads still get distinct names.
+_state = threading.local()
+_numbers = threading.Lock()
+
+class _ThreadLocal(object):
+    " class attribute holding a separate value in each thread "
+    def __init__(self, name, default):
+        self.name = name
+        self.default = default
+
+    def __get__(self, obj, cls):
+        try:
+            return getattr(_state, self.name)
+        except AttributeError:
+            value = self.default()
+            setattr(_state, self.name, value)
+            return value
+
+def _named_enter(self):
+    lineage = NamedVariables.lineage
+    with _numbers:
+        num = NamedVariables.modelnums[(lineage, self.name)]
+        NamedVariables.modelnums[(lineage, self.name)] += 1
+    _state.lineage = lineage = lineage + ((self.name, num),)
+    return lineage, NamedVariables.namedvars[lineage]
+
+def _named_exit(self, *args):
+    del NamedVariables.namedvars[NamedVariables.lineage]
+    _state.lineage = NamedVariables.lineage[:-1]
+
+def _vectorize_enter(self):
+    _state.vectorization = (self.dimension_length,) + Vectorize.vectorization
+
+def _vectorize_exit(self, *args):
+    _state.vectorization = Vectorize.vectorization[1:]
+
+def _signomials_enter(self):
+    _state.signomials = True
+
+def _signomials_exit(self, *args):
+    _state.signomials = False
+
+def install():
+    """ make gpkit's building state thread-local; safe to call again
+
+    gpkit versions that already keep this state per context (the
+    attributes are no longer plain class values) are left alone.
+    """
+    if not isinstance(NamedVariables.__dict__.get("lineage"), tuple):
+        return
+    NamedVariables.lineage = _ThreadLocal("lineage", tuple)
+    NamedVariables.namedvars = _ThreadLocal("namedvars",
+                                            lambda: defaultdict(list))
+    NamedVariables.__enter__ = _named_enter
+    NamedVariables.__exit__ = _named_exit
+    Vectorize.vectorization = _ThreadLocal("vectorization", tuple)
+    Vectorize.__enter__ = _vectorize_enter
+    Vectorize.__exit__ = _vectorize_exit
+    SignomialsEnabled._true = _ThreadLocal("signomials", bool)
+    SignomialsEnabled.__enter__ = _signomials_enter
+    SignomialsEnabled.__exit__ = _signomials_exit
+
+install()
@@ -0,0 +1,32 @@
+" case specs for batch runs: a wingmode plus substitutions by model path "
+from mission import Mission
+
+#pylint: disable=invalid-name
+
+COSTS = {"range": lambda M: 1/M.R,
+         "mass": lambda M: M.aircraft.mass}
+
+def resolve(M, path):
+    " model variable for a dotted path such as 'aircraft.battery.Estar' "
+    obj = M
+    for part in path.split("."):
+        try:
+            obj = getattr(obj, part)
+        except AttributeError:
+            obj = obj[part]
+    return obj
+
+def build(wingmode="blownwing", substitutions=None, cost="range"):
+    """ Mission for a case
+
+    substitutions maps dotted paths to values in the variable's own units,
+    so cases stay plain data that can be sent to worker processes.
+    """
+    M = Mission(wingmode=wingmode)
+    M.case = {"wingmode": wingmode, "substitutions": dict(substitutions or {}),
+              "cost": cost}
+    if substitutions:
+        M.substitutions.update({resolve(M, k): v
+                                for k, v in substitutions.items()})
+    M.cost = COSTS[cost](M)
+    return M
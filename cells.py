@@ -0,0 +1,141 @@
+" battery cell library, pack-level properties and a per-cell range sweep "
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import json
+import os
+import time
+import numpy as np
+from cases import build
+from fits import max_affine_fit
+from solvers import get_solver
+
+#pylint: disable=invalid-name
+
+CELLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cells.json")
+
+# packaging mass: structure, cooling and insulation per kg of cells, busbar
+# per cell and BMS balancing/sensing per series group [kg]
+F_STRUCT = 0.2
+M_BUSBAR = 0.002
+M_SERIES = 0.03
+TOL = 1e-3      # signomial slack above 1+TOL: the pack cannot fly the mission
+
+class Pack(namedtuple("Pack", ["cell", "S", "P", "cycles", "mass", "E",
+                               "Estar", "P_cont", "P_burst", "eta_pack",
+                               "retention"])):
+    """ pack of S series groups of P cells, after `cycles` full cycles
+
+    mass [kg] and E [Wh] are the pack's at this topology. Estar, P_cont
+    and P_burst are per kg of cells (Estar derated by the capacity
+    retention) and eta_pack is the cell mass fraction, which is how the
+    Battery model uses them, so the solve sizes the pack at these values.
+    """
+    def substitutions(self):
+        " Battery values by model path, for cases.build and the batch tools "
+        return {"aircraft.battery.Estar": self.Estar,
+                "aircraft.battery.P_max_cont": self.P_cont,
+                "aircraft.battery.P_max_burst": self.P_burst,
+                "aircraft.battery.eta_pack": self.eta_pack}
+
+def _stamp(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime, st.st_size
+
+def library(path=CELLS):
+    " cell name -> datasheet dict, reread only if the file changed "
+    return _library(_stamp(path))
+
+@lru_cache(maxsize=None)
+def _library(stamp):
+    with open(stamp[0]) as f:
+        cells = json.load(f)
+    return dict((k, v) for k, v in cells.items() if not k.startswith("_"))
+
+def degradation(name, path=CELLS):
+    """ fitted capacity loss 1 - retention = a*cycles**b of a cell
+
+    A one-term max-affine (power law) fit in log space to the cell's
+    cycling points; its rms is the fit's log error.
+    """
+    return _degradation(name, _stamp(path))
+
+@lru_cache(maxsize=None)
+def _degradation(name, stamp):
+    cycling = np.array(_library(stamp)[name]["cycling"], dtype=float)
+    return max_affine_fit(np.log(cycling[:, :1]), np.log(1 - cycling[:, 1]),
+                          K=1)
+
+def pack(name, S=110, P=20, cycles=0, path=CELLS):
+    """ pack-level properties of a cell in an S-series P-parallel pack
+
+    Cached per cell, topology and cycle count, and per version of the
+    library file. The default 110S is about 400 V nominal.
+    """
+    return _pack(name, S, P, cycles, _stamp(path))
+
+@lru_cache(maxsize=None)
+def _pack(name, S, P, cycles, stamp):
+    cell = _library(stamp)[name]
+    n = S*P
+    m_cells = n*cell["mass"]
+    mass = m_cells*(1 + F_STRUCT) + n*M_BUSBAR + S*M_SERIES
+    retention = 1. if not cycles else 1 - float(
+        _degradation(name, stamp).evaluate(cycles)[0])
+    E = n*cell["capacity"]*cell["voltage"]*retention
+    return Pack(name, S, P, cycles, mass, E, E/m_cells,
+                cell["I_cont"]*cell["voltage"]/cell["mass"],
+                cell["I_burst"]*cell["voltage"]/cell["mass"],
+                m_cells/mass, retention)
+
+def solve_cell(name, S=110, P=20, cycles=0, wingmode="blownwing",
+               substitutions=None, cost="range", solver=None, path=CELLS):
+    " solve one cell's case; runs in a worker process "
+    subs = dict(substitutions or {})
+    subs.update(pack(name, S, P, cycles, path).substitutions())
+    start = time.time()
+    M = build(wingmode, subs, cost)
+    try:
+        sol = M.localsolve(get_solver(solver), verbosity=0)
+    except Exception as e:
+        return name, None, None, str(e), time.time() - start
+    slack = max([s for _, s in sol.get("warnings", {}).get(
+        "Slack Non-GP Constraints", [])] or [1.])
+    if slack > 1 + TOL:
+        return (name, None, None, "infeasible: signomial slack %.2g%%"
+                % (100*(slack - 1)), time.time() - start)
+    return (name, float(sol(M.R).to("nmi").magnitude), float(sol["cost"]),
+            None, time.time() - start)
+
+def sweep(names=None, S=110, P=20, cycles=0, wingmode="blownwing",
+          substitutions=None, cost="range", solver=None, max_workers=None,
+          path=CELLS):
+    """ solve the aircraft with every cell in the library
+
+    Cells are solved in parallel processes with the same topology, cycle
+    count and other substitutions. Returns one dict per cell (name, R
+    [nmi], cost, status, time, pack), best range first; failed solves
+    come last.
+    """
+    names = list(names or library(path))
+    solver = get_solver(solver)
+    report = []
+    with ProcessPoolExecutor(max_workers) as pool:
+        futures = [pool.submit(solve_cell, name, S, P, cycles, wingmode,
+                               substitutions, cost, solver, path)
+                   for name in names]
+        for fut in as_completed(futures):
+            name, R, c, err, dt = fut.result()
+            report.append({"name": name, "R": R, "cost": c,
+                           "status": err or "solved", "time": dt,
+                           "pack": pack(name, S, P, cycles, path)})
+    report.sort(key=lambda r: (r["R"] is None, -(r["R"] or 0)))
+    return report
+
+if __name__ == "__main__":
+    for row in sweep():
+        p = row["pack"]
+        print("%-24s R %s  Estar %.0f Wh/kg  P_cont %.0f W/kg  eta_pack "
+              "%.3f  %s" % (row["name"], "%.2f nmi" % row["R"] if row["R"]
+                            else "-", p.Estar, p.P_cont, p.eta_pack,
+                            row["status"]))
@@ -0,0 +1,100 @@
+" relaxation diagnostics for Mission cases that fail to solve "
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import numpy as np
+from solvers import get_solver
+from mission import Mission
+from cases import resolve
+
+#pylint: disable=invalid-name
+
+# Mission constraint groups tried, in order of how often they are the cause
+GROUPS = ("takeoff", "landing", "loading", "power", "stall", "runway", "mtow")
+TOL = 1e-3      # slack above 1+TOL means the constraint had to move
+
+def plainkey(key):
+    " lineage-qualified name of a varkey, without the top model's number "
+    if not key.lineage:
+        return key.name
+    (top, _), rest = key.lineage[0], key.lineage[1:]
+    name = ".".join([top] + ["%s%s" % (n, num or "") for n, num in rest]
+                    + [key.name])
+    return name if key.idx is None else name + str(list(key.idx))
+
+def portable(substitutions):
+    """ substitutions that can be sent to a worker process
+
+    Dotted model paths are kept; model variables become plain names and
+    quantities become magnitudes in the variable's units.
+    """
+    out = {}
+    for k, v in substitutions.items():
+        key = getattr(k, "key", k)
+        if hasattr(key, "lineage"):
+            if hasattr(v, "value") and not hasattr(v, "magnitude"):
+                v = v.value     # constant gpkit monomial
+            if hasattr(v, "magnitude"):
+                v = v.to(key.units).magnitude if key.units else v.magnitude
+            k = plainkey(key)
+        out[k] = v
+    return out
+
+def relaxed_solve(wingmode, substitutions, groups, solver=None):
+    """ relax `groups` one constraint at a time and solve; worker process
+
+    Returns (groups, moved, error) where moved lists (constraint, factor)
+    for every constraint that had to be relaxed.
+    """
+    M = Mission(wingmode=wingmode, relax={"diag": groups}, relax_each=True)
+    plain = dict((plainkey(vk), vk) for vk in M.vks)
+    M.substitutions.update(dict((plain[k] if k in plain else resolve(M, k), v)
+                                for k, v in substitutions.items()))
+    M.cost = np.prod(M.slack["diag"])
+    try:
+        sol = M.localsolve(get_solver(solver), verbosity=0)
+    except Exception as e:
+        return groups, None, "%s: %s" % (type(e).__name__, e)
+    C = np.ravel(sol(M.slack["diag"]))
+    flat = list(M.relaxed["diag"].original_constraints.flat())
+    moved = [(str(c), float(v)) for c, v in zip(flat, C) if v > 1 + TOL]
+    return groups, sorted(moved, key=lambda m: -m[1]), None
+
+def diagnose(wingmode, substitutions=None, groups=GROUPS, max_size=2,
+             max_workers=None, solver=None):
+    """ smallest sets of constraint groups that make a failed case solve
+
+    Single groups are relaxed in parallel first, then pairs and so on up to
+    max_size, stopping at the first size where any set works. Returns a
+    list of dicts with the groups relaxed, the constraints that moved and
+    by how much, best (least total relaxation) first; empty if nothing up
+    to max_size helps.
+    """
+    subs = portable(substitutions or {})
+    solver = get_solver(solver)
+    for size in range(1, max_size + 1):
+        sets = list(combinations(groups, size))
+        with ProcessPoolExecutor(max_workers) as pool:
+            results = list(pool.map(relaxed_solve, [wingmode]*len(sets),
+                                    [subs]*len(sets), sets,
+                                    [solver]*len(sets)))
+        found = [{"groups": g, "moved": moved,
+                  "total": float(np.prod([f for _, f in moved]))}
+                 for g, moved, err in results if moved is not None]
+        if found:
+            return sorted(found, key=lambda d: d["total"])
+    return []
+
+def report(found):
+    " text summary of diagnose() results "
+    if not found:
+        return "No relaxation of the diagnosed constraint groups helps."
+    lines = []
+    for d in found:
+        lines.append("Relax %s (total factor %.3g):"
+                     % (" + ".join(d["groups"]), d["total"]))
+        for c, f in d["moved"]:
+            lines.append("  %5.1f%%  %s" % (100*(f - 1), c))
+        if not d["moved"]:
+            lines.append("  nothing had to move; the original failure was"
+                         " numerical")
+    return "\n".join(lines)
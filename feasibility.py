@@ -0,0 +1,132 @@
+" feasibility pre-screen for sweep and DOE points "
+import json
+import os
+from mission import Mission
+from cases import resolve
+from solvers import get_solver
+
+#pylint: disable=invalid-name
+
+# constraint families reported by the screen, as Mission constraint groups
+FAMILIES = {"runway": ("runway", "takeoff", "landing"),
+            "stall": ("stall",),
+            "mtow": ("mtow",)}
+TOL = 1e-3      # slack above 1+TOL marks a family as binding
+
+class Boundary(object):
+    """ feasibility boundary learned from past runs
+
+    `harder` maps each input path to +1 if increasing it makes a case
+    harder (e.g. payload) or -1 if decreasing it does (e.g. Srunway).
+    A new case is decided without solving when a recorded infeasible case
+    is no harder than it, or a recorded feasible case is no easier; inputs
+    not in `harder` must match exactly. Saved as json to `path`, if given.
+    """
+    def __init__(self, harder, path=None):
+        self.harder = dict(harder)
+        self.path = path
+        self.points = []
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.points = json.load(f)
+
+    def _no_harder(self, a, b):
+        " case a is at most as hard as case b "
+        if set(a) != set(b):
+            return False
+        for k in a:
+            if k in self.harder:
+                if self.harder[k]*(a[k] - b[k]) > 0:
+                    return False
+            elif a[k] != b[k]:
+                return False
+        return True
+
+    def check(self, inputs):
+        " (feasible, binding families) if the boundary decides, else None "
+        for p in self.points:
+            if not p["feasible"] and self._no_harder(p["inputs"], inputs):
+                return False, p["binding"]
+            if p["feasible"] and self._no_harder(inputs, p["inputs"]):
+                return True, []
+        return None
+
+    def add(self, inputs, feasible, binding=()):
+        self.points.append({"inputs": dict(inputs), "feasible": feasible,
+                            "binding": list(binding)})
+        if self.path:
+            with open(self.path, "w") as f:
+                json.dump(self.points, f)
+
+def relaxed_mission(wingmode="blownwing"):
+    " a new Mission with one slack per family, costed on their product "
+    M = Mission(wingmode=wingmode, relax=FAMILIES)
+    cost = 1
+    for C in M.slack.values():
+        cost *= C
+    M.cost = cost
+    return M
+
+class Screen(object):
+    """ GP screen of cases against a relaxed Mission of its own
+
+    The Mission's signomial constraints are replaced by their GP
+    approximation about x0, by default the relaxed Mission's solution at
+    its own substitutions (solved on first use), so a case costs one GP
+    solve rather than a localsolve. The approximation is conservative: a
+    case it finds feasible is feasible, while near the boundary it may
+    name a family the full solve would not.
+    """
+    def __init__(self, wingmode="blownwing", solver=None, x0=None):
+        self.M = relaxed_mission(wingmode)
+        self.solver = get_solver(solver)
+        self.x0 = x0
+
+    def binding(self, inputs):
+        " families that had to move for inputs, or ['unrelaxed'] "
+        M = self.M
+        if self.x0 is None:
+            self.x0 = M.localsolve(self.solver, verbosity=0)["freevariables"]
+        keys = [resolve(M, k) for k in inputs]
+        old = dict((k, M.substitutions[k]) for k in keys
+                   if k in M.substitutions)
+        M.substitutions.update(dict(zip(keys, inputs.values())))
+        try:
+            gp = M.sp(use_pccp=False).gp(self.x0)
+            sol = gp.solve(self.solver, verbosity=0)
+        except Exception:
+            return ["unrelaxed"]
+        finally:
+            for k in keys:
+                if k in old:
+                    M.substitutions[k] = old[k]
+                else:
+                    del M.substitutions[k]
+        return sorted(name for name, C in M.slack.items()
+                      if sol(C) > 1 + TOL)
+
+def prescreen(inputs, screen, boundary=None):
+    """ screen a case before the full solve
+
+    inputs maps dotted model paths to values, as for cases.build. The
+    learned boundary is tried first; otherwise the case goes to screen,
+    a Screen owned by the caller. Returns (feasible, binding) where
+    binding lists the families that had to move, or is ["unrelaxed"] if
+    even the relaxed program fails (a group outside FAMILIES, or the
+    solve itself).
+    """
+    if boundary is not None:
+        verdict = boundary.check(inputs)
+        if verdict is not None:
+            return verdict
+    binding = screen.binding(inputs)
+    feasible = not binding
+    if boundary is not None:
+        boundary.add(inputs, feasible, binding)
+    return feasible, binding
+
+if __name__ == "__main__":
+    b = Boundary({"Srunway": -1})
+    screen = Screen()
+    for Srunway in [10, 20, 50, 5]:
+        print(Srunway, prescreen({"Srunway": Srunway}, screen, boundary=b))
@@ -0,0 +1,263 @@
+" fitted-model registry for tabulated aero data "
+import csv
+import hashlib
+import json
+import os
+import numpy as np
+
+#pylint: disable=invalid-name
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         ".fitcache")
+
+class Fit(object):
+    """ max-affine or softmax-affine fit in log space
+
+    max-affine:      log y = max_k (b_k + A_k . log x)
+    softmax-affine:  log y = 1/alpha*log sum_k exp(alpha*(b_k + A_k . log x))
+
+    Both become GP-compatible constraints of the form y >= f(x).
+    """
+    def __init__(self, ftype, A, b, alpha=None, rms=None):
+        self.ftype = ftype
+        self.A = np.atleast_2d(np.asarray(A, dtype=float))
+        self.b = np.asarray(b, dtype=float).ravel()
+        self.alpha = alpha
+        self.rms = rms
+
+    @property
+    def K(self):
+        " number of affine terms "
+        return len(self.b)
+
+    def evaluate(self, *x):
+        " evaluate fit at (arrays of) positive inputs "
+        logx = np.log(np.column_stack([np.ravel(xi) for xi in x]))
+        z = self.b + logx.dot(self.A.T)
+        if self.ftype == "MA":
+            return np.exp(z.max(axis=1))
+        return np.exp(_logsumexp(self.alpha*z)/self.alpha)
+
+    def monomials(self, *x):
+        " one monomial per affine term, in the variables x "
+        monos = []
+        for Ak, bk in zip(self.A, self.b):
+            m = np.exp(bk)
+            for xi, ai in zip(x, Ak):
+                m = m*xi**ai
+            monos.append(m)
+        return monos
+
+    def constraints(self, y, *x, equality=False):
+        """ constraints bounding y from below by the fit
+
+        With equality=True y equals the fit instead, which stays GP only
+        for a one-term max-affine fit (a monomial).
+        """
+        monos = self.monomials(*x)
+        if equality:
+            if self.ftype != "MA" or self.K != 1:
+                raise ValueError("only a one-term max-affine fit can be an"
+                                 " equality; this %s fit has %i terms"
+                                 % (self.ftype, self.K))
+            return [y == monos[0]]
+        if self.ftype == "MA":
+            return [y >= m for m in monos]
+        return [y**self.alpha >= sum(m**self.alpha for m in monos)]
+
+    def to_dict(self):
+        " json-friendly coefficients "
+        return {"ftype": self.ftype, "A": self.A.tolist(),
+                "b": self.b.tolist(), "alpha": self.alpha, "rms": self.rms}
+
+    @classmethod
+    def from_dict(cls, d):
+        " inverse of to_dict "
+        return cls(d["ftype"], d["A"], d["b"], d.get("alpha"), d.get("rms"))
+
+    @classmethod
+    def from_monomials(cls, coeffs, exps):
+        " build a max-affine fit from c_k*prod(x_i**e_ki) terms "
+        return cls("MA", exps, np.log(coeffs))
+
+def _logsumexp(z):
+    zmax = z.max(axis=1)
+    return zmax + np.log(np.exp(z - zmax[:, None]).sum(axis=1))
+
+def _design(logx):
+    return np.column_stack([np.ones(len(logx)), logx])
+
+def max_affine_fit(logx, logy, K, ntries=10, maxiter=100, seed=0):
+    " least-squares partition fit of a max-affine function "
+    rng = np.random.RandomState(seed)
+    X = _design(logx)
+    n, d = X.shape
+    rmsfun = lambda c: np.sqrt(np.mean((X.dot(c.T).max(axis=1) - logy)**2))
+    # the single affine fit, repeated, is the fallback for empty partitions
+    # and keeps the result at least as good as K=1
+    affine = np.linalg.lstsq(X, logy, rcond=None)[0]
+    coeffs = np.tile(affine, (K, 1))
+    best = (coeffs, rmsfun(coeffs))
+    for _ in range(ntries):
+        centers = logx[rng.choice(n, K, replace=(n < K))]
+        dist = ((logx[:, None, :] - centers[None, :, :])**2).sum(axis=2)
+        part = dist.argmin(axis=1)
+        coeffs = np.tile(affine, (K, 1))
+        for _ in range(maxiter):
+            for k in range(K):
+                rows = part == k
+                if rows.sum() >= d:
+                    coeffs[k] = np.linalg.lstsq(X[rows], logy[rows],
+                                                rcond=None)[0]
+            rms = rmsfun(coeffs)
+            if rms < best[1]:
+                best = (coeffs.copy(), rms)
+            newpart = X.dot(coeffs.T).argmax(axis=1)
+            if np.array_equal(newpart, part):
+                break
+            part = newpart
+    coeffs, rms = best
+    return Fit("MA", coeffs[:, 1:], coeffs[:, 0], rms=float(rms))
+
+def softmax_affine_fit(logx, logy, K, alpha0=10.):
+    " nonlinear least-squares softmax-affine fit, seeded by max-affine "
+    from scipy.optimize import least_squares
+    X = _design(logx)
+    d = X.shape[1]
+    seed = max_affine_fit(logx, logy, K)
+    p0 = np.hstack([np.column_stack([seed.b, seed.A]).ravel(),
+                    np.log(alpha0)])
+
+    def residual(p):
+        coeffs = p[:-1].reshape(K, d)
+        alpha = np.exp(p[-1])
+        return _logsumexp(alpha*X.dot(coeffs.T))/alpha - logy
+
+    res = least_squares(residual, p0)
+    coeffs = res.x[:-1].reshape(K, d)
+    rms = np.sqrt(np.mean(res.fun**2))
+    return Fit("SMA", coeffs[:, 1:], coeffs[:, 0], float(np.exp(res.x[-1])),
+               float(rms))
+
+FITTERS = {"MA": max_affine_fit, "SMA": softmax_affine_fit}
+
+def load_table(path, sheet=None):
+    " read a header-row table from .csv or .xlsx into column arrays "
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("reading %s requires openpyxl" % path)
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        rows = list(ws.iter_rows(values_only=True))
+    else:
+        with open(path) as f:
+            rows = list(csv.reader(f))
+    header = [str(h).strip() if h is not None else "" for h in rows[0]]
+    cols = {}
+    for j, h in enumerate(header):
+        if not h:
+            continue
+        vals = [r[j] for r in rows[1:] if j < len(r)]
+        try:
+            cols[h] = np.array([float(v) for v in vals if v not in
+                                (None, "")])
+        except (TypeError, ValueError):
+            continue
+    return cols
+
+class FitRegistry(object):
+    """ named fits, loaded from tabulated data or built-in coefficients
+
+    Tables are read once per file version, fits are keyed by a hash of
+    the data and fit settings and cached to disk in `cachedir`.
+    """
+    def __init__(self, cachedir=CACHE_DIR):
+        self.cachedir = cachedir
+        self.specs = {}
+        self.defaults = {}
+        self._tables = {}
+        self._fits = {}
+
+    def default(self, name, fit):
+        " built-in fit used when no data is registered for name "
+        self.defaults[name] = fit
+
+    def register(self, name, path, xcols, ycol, K=2, ftype="MA", sheet=None,
+                 invert=False):
+        """ fit name to columns of a tabulated data file
+
+        With invert=True the fit is of 1/ycol, for quantities such as
+        efficiencies that the model needs to bound from above.
+        """
+        if ftype not in FITTERS:
+            raise ValueError("unknown fit type %s; use one of %s"
+                             % (ftype, list(FITTERS)))
+        self.specs[name] = dict(path=path, xcols=tuple(xcols), ycol=ycol,
+                                K=K, ftype=ftype, sheet=sheet, invert=invert)
+        self._fits.pop(name, None)
+
+    def table(self, path, sheet=None):
+        " column arrays for path, reread only if the file changed "
+        st = os.stat(path)
+        key = (os.path.abspath(path), sheet)
+        stamp = (st.st_mtime, st.st_size)
+        if key not in self._tables or self._tables[key][0] != stamp:
+            self._tables[key] = (stamp, load_table(path, sheet))
+        return self._tables[key][1]
+
+    def get(self, name):
+        " fitted (or default) model for name "
+        if name not in self.specs:
+            if name not in self.defaults:
+                raise KeyError("no data or default fit registered for %s"
+                               % name)
+            return self.defaults[name]
+        spec = self.specs[name]
+        cols = self.table(spec["path"], spec["sheet"])
+        x = np.column_stack([cols[c] for c in spec["xcols"]])
+        y = cols[spec["ycol"]]
+        if spec["invert"]:
+            y = 1./y
+        digest = hashlib.sha1(np.ascontiguousarray(x).tobytes()
+                              + np.ascontiguousarray(y).tobytes()
+                              + repr((spec["ftype"], spec["K"])).encode()
+                             ).hexdigest()[:16]
+        if name in self._fits and self._fits[name][0] == digest:
+            return self._fits[name][1]
+        fname = os.path.join(self.cachedir, "%s-%s.json" % (name, digest))
+        if os.path.exists(fname):
+            with open(fname) as f:
+                fit = Fit.from_dict(json.load(f))
+        else:
+            fit = FITTERS[spec["ftype"]](np.log(x), np.log(y), spec["K"])
+            if not os.path.isdir(self.cachedir):
+                os.makedirs(self.cachedir)
+            with open(fname, "w") as f:
+                json.dump(fit.to_dict(), f)
+        self._fits[name] = (digest, fit)
+        return fit
+
+registry = FitRegistry()
+
+# Aerodynamic data.xlsx tabulates per-segment solution outputs (C_D, C_f,
+# L/D for takeoff to landing) with no Re or tau columns, so there is no
+# polar to fit there; these defaults are the model's original fits
+
+# tail section drag Cd(Re, tau)
+registry.default("tail_cd", Fit.from_monomials(
+    [0.339937756, 5.446864658, 16.2594679, 9.509193806, 218.7365501],
+    [[-0.181990628, 0.774603933],
+     [-0.484866619, 0.246341522],
+     [-0.539943202, 0.466384455],
+     [-0.482346958, 0.467466389],
+     [-0.603870895, 1.312443752]]))
+# turbulent flat plate skin friction, fuselage Cf(Re)
+registry.default("fuse_cf", Fit.from_monomials([0.455], [[-0.3]]))
+# turbulent flat plate skin friction, wing Cf(Re) before margin
+registry.default("wing_cf", Fit.from_monomials([0.074], [[-0.2]]))
+
+def get_fit(name):
+    " fitted model from the default registry "
+    return registry.get(name)
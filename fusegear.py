@@ -1,4 +1,5 @@
-from gpkit import Model, parse_variables 
+from gpkit import Model, parse_variables
+from fits import get_fit
 class Gear(Model):
     """Gear
     Variables
@@ -58,7 +59,7 @@ class FuselageP(Model):
     def setup(self,fuse,state):
         constraints = [
                        FF ==fuse.l/fuse.h,
-                       C_f >= 0.455/Re**0.3,
+                       get_fit("fuse_cf").constraints(C_f, Re),
                        Cd/mfac == C_f*FF,
                        Re == state["V"]*state["rho"]*fuse.l/state["mu"],
                     ]
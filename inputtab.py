@@ -1,9 +1,36 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QGroupBox, QFormLayout, QLineEdit,
-    QPushButton, QLabel, QComboBox, QGridLayout, QTextEdit
+    QPushButton, QLabel, QComboBox, QGridLayout, QTextEdit, QCheckBox
 )
-from gpkit import units
+from PyQt5.QtCore import QThread, pyqtSignal
 from mission import Mission
+from diagnose import diagnose, report
+from solvers import get_solver
+import settings
+
+def _same(a, b):
+    " True if two input values (numbers or quantities) are equal "
+    try:
+        return a is not None and bool(a == b)
+    except Exception:
+        return False
+
+class DiagnoseThread(QThread):
+    " runs the relaxation diagnostics off the GUI thread "
+    done = pyqtSignal(str)
+
+    def __init__(self, wingtype, substitutions, message):
+        super().__init__()
+        self.wingtype = wingtype
+        self.substitutions = substitutions
+        self.message = message
+
+    def run(self):
+        try:
+            text = report(diagnose(self.wingtype, self.substitutions))
+        except Exception as e:
+            text = f"Diagnosis failed: {e}"
+        self.done.emit(f"{self.message}\n\n{text}")
 
 class InputsTab(QWidget):
     def __init__(self, parent_callback):
@@ -83,6 +110,9 @@ class InputsTab(QWidget):
         self.solve_button.clicked.connect(self.run_solve)
         main_layout.addWidget(self.solve_button)
 
+        self.diagnose_box = QCheckBox("Diagnose failed solves (relaxes constraint groups, slow)")
+        main_layout.addWidget(self.diagnose_box)
+
         self.summary_box = QTextEdit()
         self.summary_box.setReadOnly(True)
         main_layout.addWidget(QLabel("✈️ Mission Summary:"))
@@ -90,69 +120,76 @@ class InputsTab(QWidget):
 
         self.setLayout(main_layout)
 
+    def varmap(self, M):
+        " Variable mapping from string key to model variable (see settings.py) "
+        return dict((key, settings.variable(M, key)) for key in self.inputs)
+
+    def model(self, wingtype):
+        """ Mission for wingtype, kept between solves
+
+        A new Mission is only built when the wing type changes; otherwise
+        the last one is reused and only changed inputs are re-applied.
+        """
+        if getattr(self, "wingtype", None) != wingtype:
+            M = Mission(wingmode=wingtype)
+            M.cost = 1 / M.R
+            self.mission, self.solution, self.wingtype = M, None, wingtype
+            self.vars = self.varmap(M)
+            # model values the inputs override, restored when cleared
+            self.defaults = dict((key, M.substitutions[var])
+                                 for key, var in self.vars.items()
+                                 if var.key in M.substitutions)
+            self.applied = {}
+        return self.mission
+
+    def start_diagnosis(self, wingtype, substitutions, message):
+        " diagnose a failed solve in a DiagnoseThread; solving waits for it "
+        self.summary_box.setText(f"{message}\n\nDiagnosing...")
+        self.solve_button.setEnabled(False)
+        self.diagnosis = DiagnoseThread(wingtype, substitutions, message)
+        self.diagnosis.done.connect(self.summary_box.setText)
+        self.diagnosis.finished.connect(lambda: self.solve_button.setEnabled(True))
+        self.diagnosis.start()
+
     def run_solve(self):
         try:
             wingtype = self.wing_selector.currentText()
-            M = Mission(wingmode=wingtype)
+            M = self.model(wingtype)
+            varmap = self.vars
 
-            # Variable mapping from string key to model variable
-            varmap = {
-                "AR": M.aircraft.bw.wing.planform.AR,
-                "b": M.aircraft.bw.wing.planform.b,
-                "lam": M.aircraft.bw.wing.planform.lam,
-                "tau": M.aircraft.bw.wing.planform.tau,
-                "V_h": M.aircraft.htail.Vh,
-                "V_v": M.aircraft.vtail.Vv,
-                "l_fus": M.aircraft.fuselage.l,
-                "w_fus": M.aircraft.fuselage.w,
-                "h_fus": M.aircraft.fuselage.h,
-                "C_Lmax": M.CLmax,
-                "C_D0": M.cruise.perf.bw_perf.C_D,
-                "e": M.cruise.perf.bw_perf.e,
-                "V_cruise": M.cruise.flightstate.V,
-                "V_stall": M.Vstall,
-                "m_batt": M.aircraft.battery.m,
-                "E_batt": M.aircraft.battery.E_capacity,
-                "eta": M.aircraft.bw.powertrain.eta,
-                "n_prop": M.aircraft.bw.n_prop,
-                "rho": M.cruise.flightstate.rho,
-                "mu": M.cruise.flightstate.mu,
-                "E_Star":M.aircraft.battery.Estar,
-                "b_eta":M.aircraft.battery.eta_pack
-            }
-
-            unitmap = {
-                "b": units.ft,
-                "V_cruise": units.kts,
-                "V_stall": units.kts,
-                "l_boom": units.m,
-                "l_fus": units.m,
-                "w_fus": units.m,
-                "h_fus": units.m,
-                "m_batt": units.kg,
-                "E_batt": units.kWh,
-                "rho": units.kg / units.m**3,
-                "mu": units.kg / (units.m * units.s),
-                "E_Star":units("Wh/kg")
-            }
-
-            substitutions = {}
+            values = {}
             for key, field in self.inputs.items():
                 val = field.text().strip()
                 if val:
                     try:
                         parsed = float(val)
-                        var = varmap[key]
-                        unit = unitmap.get(key, 1)
-                        substitutions[var] = parsed * unit
+                        if key not in varmap:
+                            raise KeyError(key)
+                        values[key] = settings.quantity(key, parsed)
                     except Exception as e:
                         print(f"⚠️ Invalid input for '{key}': {e}")
 
-            if substitutions:
-                M.substitutions.update(substitutions)
+            # apply only what changed since the last solve
+            for key in set(self.applied) - set(values):
+                if key in self.defaults:
+                    M.substitutions[varmap[key]] = self.defaults[key]
+                else:
+                    del M.substitutions[varmap[key]]
+            M.substitutions.update(dict((varmap[key], v) for key, v in
+                                        values.items()
+                                        if not _same(self.applied.get(key), v)))
+            self.applied = values
+            substitutions = dict((varmap[key], v) for key, v in values.items())
 
-            M.cost = 1 / M.R
-            sol = M.localsolve("cvxopt")
+            try:
+                # warm start from the previous optimum of this model
+                x0 = self.solution["freevariables"] if self.solution else None
+                sol = M.localsolve(get_solver(), x0=x0)
+            except Exception as e:
+                if not self.diagnose_box.isChecked():
+                    raise
+                self.start_diagnosis(wingtype, substitutions, f"❌ Solve failed: {e}")
+                return
 
             self.mission = M
             self.solution = sol
@@ -0,0 +1,187 @@
+" SQLite-backed job queue for distributed Mission solves "
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from multiprocessing import Process
+from cases import build
+from resultsink import record
+from solvers import get_solver
+
+#pylint: disable=invalid-name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY,
+    wingmode    TEXT NOT NULL,
+    subs        TEXT NOT NULL,
+    cost        TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    heartbeat   REAL,
+    result      TEXT,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+class JobQueue(object):
+    """ cases waiting to be solved, in one SQLite file
+
+    Jobs go pending -> running -> done, or back to pending when a solve
+    fails or its worker stops sending heartbeats, until max_attempts is
+    used up and the job is marked failed. Workers on other hosts need the
+    file on storage with working POSIX locks; a single box needs nothing.
+    """
+    def __init__(self, path, max_attempts=3, stale=120.):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.stale = stale
+        self.db = connect(path)
+        self.db.executescript(SCHEMA)
+
+    def enqueue(self, wingmode="blownwing", substitutions=None,
+                cost="range"):
+        " add a case as for cases.build; returns the job id "
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO jobs (wingmode, subs, cost) VALUES (?, ?, ?)",
+                (wingmode, json.dumps(substitutions or {}), cost))
+        return cur.lastrowid
+
+    def claim(self, worker):
+        " next pending job as (id, wingmode, substitutions, cost), or None "
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._reclaim()
+            row = self.db.execute(
+                "SELECT id, wingmode, subs, cost FROM jobs"
+                " WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE jobs SET status = 'running', worker = ?,"
+                " heartbeat = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, time.time(), row[0]))
+        return row[0], row[1], json.loads(row[2]), row[3]
+
+    def _reclaim(self):
+        " requeue running jobs whose worker went quiet "
+        cutoff = time.time() - self.stale
+        self.db.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'pending'"
+            " ELSE 'failed' END, error = 'heartbeat lost on ' || worker"
+            " WHERE status = 'running' AND heartbeat < ?",
+            (self.max_attempts, cutoff))
+
+    def beat(self, job_id, worker):
+        " refresh a running job's heartbeat; False if it was reclaimed "
+        with self.db:
+            cur = self.db.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ?"
+                " AND status = 'running'", (time.time(), job_id, worker))
+        return cur.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL"
+                " WHERE id = ? AND worker = ?",
+                (json.dumps(result), job_id, worker))
+
+    def fail(self, job_id, worker, error):
+        " record a failed attempt; the job is retried until max_attempts "
+        with self.db:
+            self.db.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ?"
+                " THEN 'pending' ELSE 'failed' END, error = ?"
+                " WHERE id = ? AND worker = ?",
+                (self.max_attempts, error, job_id, worker))
+
+    def counts(self):
+        " number of jobs by status "
+        return dict(self.db.execute(
+            "SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def results(self):
+        " (id, wingmode, substitutions, result) for every finished job "
+        for row in self.db.execute(
+                "SELECT id, wingmode, subs, result FROM jobs"
+                " WHERE status = 'done' ORDER BY id"):
+            yield row[0], row[1], json.loads(row[2]), json.loads(row[3])
+
+    def close(self):
+        self.db.close()
+
+def connect(path):
+    " connection that waits on locks instead of failing "
+    db = sqlite3.connect(path, timeout=60., isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    return db
+
+def work(path, worker=None, beat=10., poll=2., wait=False, solver=None,
+         stale=120.):
+    """ solve jobs from the queue at path until it is empty
+
+    Each job's heartbeat is refreshed every `beat` seconds from a
+    background thread while it solves; jobs whose heartbeat is older than
+    `stale` seconds are taken back from their worker. With wait=True the
+    worker keeps polling for new jobs instead of exiting.
+    """
+    worker = worker or "%s:%d" % (socket.gethostname(), os.getpid())
+    queue = JobQueue(path, stale=stale)
+    solver = get_solver(solver)
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            if not wait:
+                break
+            time.sleep(poll)
+            continue
+        job_id, wingmode, subs, cost = job
+        done = threading.Event()
+
+        def heartbeat():
+            beats = JobQueue(path, stale=stale)
+            while not done.wait(beat):
+                beats.beat(job_id, worker)
+            beats.close()
+
+        thread = threading.Thread(target=heartbeat)
+        thread.daemon = True
+        thread.start()
+        start = time.time()
+        try:
+            M = build(wingmode, subs, cost)
+            sol = M.localsolve(solver, verbosity=0)
+            result = record(M, sol, subs, "solved", time.time() - start)
+        except Exception as e:
+            result = None
+            error = "%s: %s" % (type(e).__name__, e)
+        finally:
+            done.set()
+            thread.join()
+        if result is not None:
+            queue.complete(job_id, worker, result)
+        else:
+            queue.fail(job_id, worker, error)
+    queue.close()
+
+def run_local(path, n_workers=2, **kwargs):
+    " drain the queue with n_workers worker processes on this machine "
+    procs = [Process(target=work, args=(path,), kwargs=kwargs)
+             for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+if __name__ == "__main__":
+    # python jobqueue.py QUEUE.db [N_WORKERS]: run workers on this host
+    path = sys.argv[1] if len(sys.argv) > 1 else "jobs.db"
+    run_local(path, int(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    print(JobQueue(path).counts())
@@ -1,6 +1,32 @@
 import gpkit
 from gpkit import Model, parse_variables, Vectorize, SignomialEquality,Variable,units
+from gpkit import ConstraintSet
+from gpkit.constraints.relax import ConstraintsRelaxedEqually, ConstraintsRelaxed
 from aircraft import *
+from solvers import get_solver, timed_solve
+
+# mission segments in propeller schedule order: the four takeoff steps,
+# obstacle climb, climb, cruise and landing
+PROP_SEGMENTS = ("TO1", "TO2", "TO3", "TO4", "CL1", "CL2", "CR", "L")
+
+def active(aircraft, perf):
+    " propellers driving a segment: the blown wing's n_active, else n_prop "
+    return getattr(perf.bw_perf, "n_active", aircraft.bw.n_prop)
+
+def steps(aircraft, segments):
+    " (t, P_motor, n_active, P_batt) of each time step of the segments "
+    out = []
+    for seg in segments:
+        seg = getattr(seg, "legs", seg)
+        values = [seg.t, seg.perf.bw_perf.P, active(aircraft, seg.perf),
+                  seg.perf.batt_perf.P]
+        if not getattr(seg.t, "shape", None):
+            out.append(tuple(values))
+            continue
+        for i in range(seg.t.shape[0]):
+            out.append(tuple(v[i] if getattr(v, "shape", None) else v
+                             for v in values))
+    return out
 
 
 class FlightState(Model):
@@ -39,19 +65,82 @@ class Mission(Model):
     t_tot                           [s]         time of flight
     """
     @parse_variables(__doc__,globals())
-    def setup(self,perf=False,wingmode="blownwing"):
+    def setup(self,perf=False,wingmode="blownwing",relax=None,relax_each=False,
+              load_cases=None,props=None,legs=1,thermal=False,propmap=False,
+              taper=1.,motors=None):
 
-        self.aircraft = Aircraft(wingmode =wingmode)
+        self.wingmode = wingmode
+        # props gives the active propellers of each blown wing segment in
+        # PROP_SEGMENTS order, None for all n_prop, e.g. two in cruise:
+        # [None]*6 + [2, None]. Each count is the segment's bw_perf.n_active
+        # and can also be substituted after the build; with legs > 1 the
+        # cruise entry may be a list with one count per leg
+        props = list(props) if props is not None else [None]*len(PROP_SEGMENTS)
+        if len(props) != len(PROP_SEGMENTS):
+            raise ValueError("props needs one count per segment %s"
+                             % (PROP_SEGMENTS,))
+        counts = [n for p in props for n in
+                  (p if isinstance(p, (list, tuple)) else [p]) if n is not None]
+        if counts and wingmode != "blownwing":
+            raise ValueError("props schedules blown wing propellers; "
+                             "wingmode %r has none" % wingmode)
+        self.props = props
+        takeoff = None if all(n is None for n in props[:4]) else props[:4]
+        # with thermal the winding and pack temperatures limit the power in
+        # place of the motor power margin and the pack's continuous rating;
+        # the motors' catalogue continuous rating still holds in climb and
+        # cruise
+        mode = {"powermode": "thermal"} if thermal else {}
+        # with propmap every segment's eta_prop comes from the propeller map
+        # (propeller.py, the built-in sample map unless load_map was called)
+        # instead of the fixed 0.75 takeoff/landing and 0.87 climb/cruise.
+        # The sample map is a fixed-pitch propeller, down to eta_prop 0.16
+        # at the start of the takeoff roll: the na wing's single propeller
+        # then needs about 2.6 times the 750 kg MTOW, so na with propmap is
+        # infeasible unless a map fit for it is loaded
+        # taper is the main wing's chord distribution exponent, 1 for a
+        # straight taper (see planform.geometry)
+        # motors is a motor catalogue table the powertrain relations are
+        # fitted to (see motors.py), None for the built-in magicALL fits
+        self.aircraft = Aircraft(wingmode =wingmode,propmap=propmap,taper=taper,
+                                 motors=motors)
+        # counts are checked against n_prop as built; a later n_prop
+        # substitution must keep them within it
+        n_prop = self.aircraft.bw.substitutions[self.aircraft.bw.n_prop]
+        for n in counts:
+            if not 0 < n <= n_prop:
+                raise ValueError("active propeller count %s is not in "
+                                 "(0, n_prop = %s]" % (n, n_prop))
         with Vectorize(4):
-            self.takeoff = TakeOff(self.aircraft)
-        self.obstacle_climb = Climb(self.aircraft)
-        self.climb = Climb(self.aircraft,seg=False)
-        self.cruise = Cruise(self.aircraft,wingmode= wingmode)
-        self.landing = Landing(self.aircraft)
+            self.takeoff = TakeOff(self.aircraft,n_active=takeoff,**mode)
+        self.obstacle_climb = Climb(self.aircraft,n_active=props[4],**mode)
+        self.climb = Climb(self.aircraft,n_active=props[5],**mode)
+        if legs > 1:
+            self.cruise = CruiseLegs(self.aircraft,wingmode,legs,n_active=props[6],**mode)
+        else:
+            self.cruise = Cruise(self.aircraft,wingmode= wingmode,n_active=props[6],**mode)
+        self.landing = Landing(self.aircraft,n_active=props[7],**mode)
         Wcent = Variable("W_{cent}","lbf","center aircraft weight")
         Wh = Variable("W_{htail}", "lbf", "horizontal tail weight")
         Wv = Variable("W_{vtail}", "lbf", "vertical tail weight")
-        loading = self.aircraft.loading(self.cruise.flightstate,Wcent, Wh, Wv)
+        # extra structural load cases as (name, Nmax, Vne), e.g. a gust
+        # case ("gust", 6, 130); Vne [kts] sets the case's tail loads and
+        # None keeps the cruise load state's. The cases share one
+        # FlightState vectorized over them
+        load_cases = list(load_cases or [])
+        cstate = None
+        if load_cases:
+            with Vectorize(len(load_cases)):
+                cstate = FlightState()
+            loadstate = self.cruise.loadstate
+            Vne = [v for _, _, v in load_cases]
+            cstate.substitutions[cstate.Vne] = (
+                lambda c: [c(loadstate.Vne) if v is None else v*units("kts")
+                           for v in Vne])
+        loading = self.aircraft.loading(self.cruise.loadstate,Wcent, Wh, Wv,
+                                        cases=[(name, Nmax) for name, Nmax, _
+                                               in load_cases],
+                                        cstate=cstate)
         self.loading = loading
         S = self.S = self.aircraft.bw.wing["S"]
         
@@ -60,23 +149,39 @@ class Mission(Model):
         #self.t_tot = sum(s.t for s in self.fs)
         
         state = FlightState()#self.flightstate
+        # constraints are kept in named groups so they can be relaxed and
+        # diagnosed group by group; the groups together are the mission
         with gpkit.SignomialsEnabled():
             if wingmode =="blownwing":
-               constraints=[CJmax >= self.takeoff.perf.bw_perf.C_J,
+                groups = {"mission": [CJmax >= self.takeoff.perf.bw_perf.C_J,
                              CJmax >= self.landing.perf.bw_perf.C_J,
                              self.aircraft.htail.Vh >= 0.001563*CJmax*CLmax + 0.0323*CLmax + 0.03014*CJmax + 0.5216,
                              self.climb.perf.bw_perf.C_LC == 0.611,
-                              
-                            CLmax >= self.takeoff.perf.bw_perf.C_L,
+                              ],
+                          "runway": [Srunway <= 100*units("m"),],
+                          "loading": [loading.hl["W"] ==Wcent,#>=self.aircraft.htail.W,# >=1*units("lbf"),
+                             loading.vl["W"] ==Wcent,# >=self.aircraft.vtail.W,
+                             ]}
+            else:
+                groups = {"mission": [self.aircraft.htail.Vh >= 0.2*CLmax+0.5,
+                                CLmax<=2.5,
+                                ],
+                          "runway": [Srunway <= 1000*units("m"),],
+                          "loading": [loading.hl["W"] >=self.aircraft.htail.W,# >=1*units("lbf"),
+
+                                loading.vl["W"] >=self.aircraft.vtail.W,#>=1*units("lbf"),
+                                ]}
+            groups["mission"] += [CLmax >= self.takeoff.perf.bw_perf.C_L,
                             CLmax >= self.landing.perf.bw_perf.C_L,
                             self.obstacle_climb.h_gain >= 50*units("ft"),
                             self.climb.h_gain >= 2000*units("ft") - self.obstacle_climb.h_gain,
                             #self.climb.Sclimb == 10*units("nmi"),
-                            0.5*state.rho*CLstall*self.aircraft.bw.wing.planform.S*Vs**2 == self.aircraft.mass*g,
+                            ]
+            groups["stall"] = [0.5*state.rho*CLstall*self.aircraft.bw.wing.planform.S*Vs**2 == self.aircraft.mass*g,
                             Vs <= Vstall,
                             Vs >= 42*units("kts"),
-                            Srunway <= 100*units("m"),
-                            self.takeoff.dV == self.dV,
+                            ]
+            groups["takeoff"] = [self.takeoff.dV == self.dV,
                             (self.takeoff.fs.V[-1]/self.takeoff.mstall)**2 >= (2*self.aircraft.mass*g/(self.takeoff.rho*self.takeoff.S*self.takeoff.perf.bw_perf.C_L[-1])),
                             0.5*self.takeoff.perf.bw_perf.C_L[-1]*self.takeoff.perf.fs.rho*S*self.takeoff.fs.V[-1]**2 >= self.aircraft.mass*g,
                             self.takeoff.perf.bw_perf.C_L[0:-1] >= 1e-4,
@@ -89,67 +194,57 @@ class Mission(Model):
                             self.takeoff.fs.V[1] >= sum(self.takeoff.dV[:2]),
                             self.takeoff.fs.V[2] >= sum(self.takeoff.dV[:3]),
                             self.takeoff.fs.V[-1] <=  sum(self.takeoff.dV),
-                            Srunway >= self.landing.Sgr*mrunway,
                             Sobstacle <= Srunway + 100*units("ft"),#"obstacle distance"),
                             Sobstacle >= mobstacle*(sum(self.takeoff.Sto)+ self.obstacle_climb.Sclimb),
-                            loading.wingl["W"] == Wcent,
+                            ]
+            groups["landing"] = [Srunway >= self.landing.Sgr*mrunway,]
+            groups["loading"] += [loading.wingl["W"] == Wcent,
                             Wcent >= self.aircraft.mass*g,
-                            loading.hl["W"] ==Wcent,#>=self.aircraft.htail.W,# >=1*units("lbf"),
-                            self.aircraft.mass<=750*units("kg"),
-                            loading.vl["W"] ==Wcent,# >=self.aircraft.vtail.W,
-                            self.climb.perf.bw_perf.P <=  self.aircraft.bw.n_prop*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,
-                            self.cruise.perf.bw_perf.P <= self.aircraft.bw.n_prop*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,
+                            ]
+            groups["mtow"] = [self.aircraft.mass<=750*units("kg"),]
+            groups["power"] = [self.climb.perf.bw_perf.P <=  active(self.aircraft,self.climb.perf)*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,
+                            self.cruise.perf.bw_perf.P <= active(self.aircraft,self.cruise.perf)*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,
                             #self.aircraft.battery.E_capacity/self.cruise.t>= self.aircraft.bw.n_prop*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,#energy consumed by 2 prop 
                             #self.R>=30*units("km"),
-                            
-                        ]
+                            self.aircraft.battery.E_capacity*0.8 >= sum(s.E if isinstance(s,CruiseLegs) else s.t*s.perf.batt_perf.P for s in self.fs),
+                            ]
+            if thermal:
+                self.thermal = Thermal(self.aircraft.bw.powertrain,self.aircraft.battery,
+                                       steps(self.aircraft,[self.takeoff,self.obstacle_climb,self.climb,self.cruise,self.landing]))
+                groups["thermal"] = [self.thermal]
+            if not perf:
+                groups["mission"] += [self.R >=1*units("nmi"),]#"cruise range minimum")]
+            groups["mission"] += [self.R <= self.cruise.R]
+
+        # relax maps a slack name to the groups it relaxes, e.g.
+        # {"runway": ("runway", "takeoff", "landing")}; each slack variable
+        # is >= 1 and equal to 1 when its groups hold as written. With
+        # relax_each every constraint in the groups gets its own slack
+        self.groups = dict(groups)
+        self.slack = {}
+        self.relaxed = {}
+        for name, members in (relax or {}).items():
+            members = ConstraintSet([groups.pop(k) for k in members])
+            if relax_each:
+                relaxed = ConstraintsRelaxed(ConstraintSet(list(members.flat()),
+                                                           members.substitutions))
+                self.slack[name] = relaxed.relaxvars
             else:
-               constraints=[self.aircraft.htail.Vh >= 0.2*CLmax+0.5,
-                                CLmax<=2.5,
-                                CLmax >= self.takeoff.perf.bw_perf.C_L,
-                                CLmax >= self.landing.perf.bw_perf.C_L,
-                                self.obstacle_climb.h_gain >= 50*units("ft"),
-                                self.climb.h_gain >= 2000*units("ft") - self.obstacle_climb.h_gain,
-                                #self.climb.Sclimb == 10*units("nmi"),
-                                0.5*state.rho*CLstall*self.aircraft.bw.wing.planform.S*Vs**2 == self.aircraft.mass*g,
-                                Vs <= Vstall,
-                                Vs >= 42*units("kts"),
-                                Srunway <= 1000*units("m"),
-                                self.takeoff.dV == self.dV,
-                                (self.takeoff.fs.V[-1]/self.takeoff.mstall)**2 >= (2*self.aircraft.mass*g/(self.takeoff.rho*self.takeoff.S*self.takeoff.perf.bw_perf.C_L[-1])),
-                                0.5*self.takeoff.perf.bw_perf.C_L[-1]*self.takeoff.perf.fs.rho*S*self.takeoff.fs.V[-1]**2 >= self.aircraft.mass*g,
-                                self.takeoff.perf.bw_perf.C_L[0:-1] >= 1e-4,
-                                Srunway >= mrunway*sum(self.takeoff.Sto),
-                                self.takeoff.dV[0]*0.5*self.takeoff.t[0] == self.takeoff.Sto[0],
-                                sum(self.takeoff.dV[:2])*0.5*self.takeoff.t[1] <= self.takeoff.Sto[1],
-                                sum(self.takeoff.dV[:3])*0.5*self.takeoff.t[2] <= self.takeoff.Sto[2],
-                                sum(self.takeoff.dV[:4])*0.5*self.takeoff.t[3] <= self.takeoff.Sto[3],
-                                self.takeoff.fs.V[0] >= sum(self.takeoff.dV[:1]),
-                                self.takeoff.fs.V[1] >= sum(self.takeoff.dV[:2]),
-                                self.takeoff.fs.V[2] >= sum(self.takeoff.dV[:3]),
-                                self.takeoff.fs.V[-1] <=  sum(self.takeoff.dV),
-                                Srunway >= self.landing.Sgr*mrunway,
-                                Sobstacle <= Srunway + 100*units("ft"),#"obstacle distance"),
-                                Sobstacle >= mobstacle*(sum(self.takeoff.Sto)+ self.obstacle_climb.Sclimb),
-                                loading.wingl["W"] == Wcent,
-                                Wcent >= self.aircraft.mass*g, 
-                                self.aircraft.mass<=750*units("kg"),
-                                
-                                loading.hl["W"] >=self.aircraft.htail.W,# >=1*units("lbf"),
+                relaxed = ConstraintsRelaxedEqually(members)
+                self.slack[name] = relaxed.relaxvar
+            self.relaxed[name] = relaxed
+            groups[name] = relaxed
+        constraints = list(groups.values())
+        # gpkitmodels' shared g keeps its value only in the first model that
+        # uses it, so every Mission substitutes it itself
+        substitutions = {g: 9.81}
+        if thermal:
+            substitutions[self.aircraft.bw.powertrain.P_margin] = 1
+        return [constraints,self.aircraft,self.fs, loading], substitutions
 
-                                loading.vl["W"] >=self.aircraft.vtail.W,#>=1*units("lbf"),
-                                self.climb.perf.bw_perf.P <=  self.aircraft.bw.n_prop*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,
-                                self.cruise.perf.bw_perf.P <= self.aircraft.bw.n_prop*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,
-                                #self.aircraft.battery.E_capacity/self.cruise.t>= self.aircraft.bw.n_prop*self.aircraft.bw.powertrain.P_m_sp_cont*self.aircraft.bw.powertrain.m,#energy consumed by 2 prop 
-                                #self.R>=30*units("km"),
-                                 ]
-        if not perf:
-            constraints += [self.R >=1*units("nmi"),]#"cruise range minimum")]
-        constraints += [self.aircraft.battery.E_capacity*0.8 >= sum(s.t*s.perf.batt_perf.P for s in self.fs),
-                        ]
-        with gpkit.SignomialsEnabled():
-            constraints += [self.R <= self.cruise.R]
-        return constraints,self.aircraft,self.fs, loading,
+    def timedsolve(self, budget=None, **kwargs):
+        " (sol, converged) within a wall-clock budget; see solvers.timed_solve "
+        return timed_solve(self, budget, **kwargs)
 
 class TakeOff(Model):
     """
@@ -169,11 +264,11 @@ class TakeOff(Model):
     a                       [m/s/s]     takeoff segment acceleration
     """
     @parse_variables(__doc__,globals())
-    def setup(self, aircraft,N=5):
+    def setup(self, aircraft,N=5,n_active=None,powermode=True):
         self.fs = FlightState()
         Pmax = aircraft.bw.powertrain.Pmax
         AR = aircraft.bw.wing.planform.AR
-        perf = aircraft.dynamic(self.fs,groundroll=True)
+        perf = aircraft.dynamic(self.fs,groundroll=True,n_active=n_active,powermode=powermode)
         self.perf = perf
         e = perf.bw_perf.e
         with gpkit.SignomialsEnabled():
@@ -181,13 +276,14 @@ class TakeOff(Model):
                 rho == self.fs.rho,
                 S == aircraft.bw.wing["S"],
                 W == aircraft.mass*g,
-                self.perf.bw_perf.eta_prop == 0.75,
                 CDg == perf.bw_perf.C_D,
                 (T-0.5*CDg*rho*S*self.fs.V**2)/aircraft.mass >= a,
                 t*a == dV,
                 T <= perf.bw_perf.T,
-                aircraft.bw.n_prop*Pmax >= perf.P,
+                active(aircraft,perf)*Pmax >= perf.P,
                 ]
+        if not aircraft.bw.propModel:
+            constraints += [self.perf.bw_perf.eta_prop == 0.75]
 
 
         return constraints, self.fs, perf
@@ -211,10 +307,10 @@ class Climb(Model):
     h_dot       \\dot{h}
     """
     @parse_variables(__doc__,globals())
-    def setup(self,aircraft,powermode=True,seg= False):
+    def setup(self,aircraft,powermode=True,n_active=None):
 
         self.flightstate = FlightState()
-        perf = aircraft.dynamic(self.flightstate,powermode=powermode,seg = seg)
+        perf = aircraft.dynamic(self.flightstate,powermode=powermode,n_active=n_active)
         self.perf = perf
         CL = self.CL = perf.bw_perf.C_L
         S = self.S = aircraft.bw.wing["S"]
@@ -223,15 +319,17 @@ class Climb(Model):
         rho = perf.fs.rho
 
         constraints = [
-            perf.batt_perf.P <= aircraft.battery.m*aircraft.battery.P_max_cont*aircraft.battery.eta_pack,
-            perf.bw_perf.eta_prop == 0.87,
             W ==  aircraft.mass*g,
             perf.bw_perf.C_T*rho*S*V**2 >= 0.5*CD*rho*S*V**2 + W*h_dot/V,
             self.h_gain <= h_dot*t,
             Sclimb == V*t, 
-            aircraft.bw.n_prop*aircraft.bw.powertrain.Pmax >= perf.P,
+            active(aircraft,perf)*aircraft.bw.powertrain.Pmax >= perf.P,
             self.flightstate #sketchy constraint, is wrong with cos(climb angle)
         ]
+        if powermode != "thermal":
+            constraints += [perf.batt_perf.P <= aircraft.battery.m*aircraft.battery.P_max_cont*aircraft.battery.eta_pack]
+        if not aircraft.bw.propModel:
+            constraints += [perf.bw_perf.eta_prop == 0.87]
         return constraints, perf
 
 class Cruise(Model):
@@ -244,19 +342,57 @@ class Cruise(Model):
     Vmin  98    [kts]       cruise minimum speed
     """
     @parse_variables(__doc__,globals())
-    def setup(self,aircraft,wingmode):
+    def setup(self,aircraft,wingmode,n_active=None,powermode=False):
 
-        self.flightstate = FlightState()
-        self.perf = aircraft.dynamic(self.flightstate,powermode =False,seg =True)
+        self.flightstate = self.loadstate = FlightState()
+        self.perf = aircraft.dynamic(self.flightstate,powermode =powermode,n_active=n_active)
         constraints = [R <= t*self.flightstate.V, # speed *t is distance 
                        self.flightstate["V"] >= Vmin,
-                       self.perf.bw_perf.eta_prop == 0.87,
-                       aircraft.bw.n_prop*aircraft.bw.powertrain.Pmax >= self.perf.P,
+                       active(aircraft,self.perf)*aircraft.bw.powertrain.Pmax >= self.perf.P,
                        ]
+        if not aircraft.bw.propModel:
+            constraints += [self.perf.bw_perf.eta_prop == 0.87]
         if wingmode=="blownwing":
             constraints +=[self.perf.bw_perf.C_LC == 0.534,]
 
         return constraints, self.flightstate, self.perf
+
+class CruiseLegs(Model):
+    """ cruise flown in legs, each a Cruise with its own speed and power
+
+    Each leg covers its fraction f_leg of the cruise range (equal by
+    default; substitute to reshape the profile) and gets its own flight
+    state, power draw and active propellers (n_active, a count or one per
+    leg), so speed and power are scheduled in the same solve. The split
+    itself is not optimized: freed under sum(f_leg) >= 1 it is a nearly
+    flat direction the signomial solve crosses about 1% per GP. Legs
+    therefore differ only through n_active or f_leg, and legs with the
+    same inputs solve to the same leg. The legs' models are vectors under
+    self.legs (leg times are legs.t); self.perf and self.flightstate
+    point at them.
+
+    Variables
+    ---------
+    R           [nmi]       cruise range
+    E           [kWh]       battery energy used in cruise
+    """
+    @parse_variables(__doc__,globals())
+    def setup(self,aircraft,wingmode,legs=3,n_active=None,powermode=False):
+        with Vectorize(legs):
+            self.legs = Cruise(aircraft,wingmode,n_active=n_active,powermode=powermode)
+            f_leg = self.f_leg = Variable("f_{leg}", np.ones(legs)/legs, "-",
+                                          "fraction of the cruise range")
+        self.perf = self.legs.perf
+        self.flightstate = self.legs.flightstate
+        # the structure is loaded at the fastest leg's Vne
+        self.loadstate = FlightState()
+        Vne = self.flightstate.Vne
+        self.loadstate.substitutions[self.loadstate.Vne] = lambda c: c(Vne).max()
+        legs = self.legs
+        constraints = [legs.R >= f_leg*R,
+                       E >= (legs.t*legs.perf.batt_perf.P).sum(),
+                       ]
+        return constraints, self.legs, self.loadstate
     
 class Landing(Model):
     """ landing model
@@ -285,14 +421,14 @@ class Landing(Model):
     t                       [s]         time of landing maneuver
     """
     @parse_variables(__doc__,globals())
-    def setup(self, aircraft,powermode =True):
+    def setup(self, aircraft,powermode ='tol',n_active=None):
 
 
         fs = FlightState()
 
         S = self.S = aircraft.bw.wing["S"]
         rho = fs.rho
-        perf = aircraft.dynamic(fs,powermode='tol')
+        perf = aircraft.dynamic(fs,powermode=powermode,n_active=n_active)
         CL = perf.bw_perf.C_L
         CD = perf.bw_perf.C_D
         V = perf.fs.V
@@ -310,12 +446,14 @@ class Landing(Model):
                 Xla >= Xgr,
                 Sgr >= Xla,
                 t >= Sgr/(0.3*V),
-                perf.bw_perf.eta_prop == 0.75,
-                aircraft.bw.n_prop*aircraft.bw.powertrain.Pmax >= self.perf.P,
+                active(aircraft,self.perf)*aircraft.bw.powertrain.Pmax >= self.perf.P,
 
             ]
+        if not aircraft.bw.propModel:
+            constraints += [perf.bw_perf.eta_prop == 0.75]
 
         return constraints, fs,perf
+
 '''
 def RegularSolve():
     poweredwheels = False
@@ -326,7 +464,7 @@ def RegularSolve():
    # M.substitutions.update({M.aircraft.mass:500})
     M.cost =M.aircraft.mass
 #    M.debug()
-    sol = M.localsolve(solver='cvxopt')
+    sol = M.localsolve(solver=get_solver())
     # print M.program.gps[-1].result.summary()
     # print sol.summary()
     #sd = get_highestsens(M, sol, N=10)
@@ -340,13 +478,13 @@ def MassCurves():
        range_sweep = np.linspace(10,1000,5)
        M.substitutions.update({M.Srunway:('sweep',range_sweep)})
        M.cost = M.aircraft.mass
-       sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+       sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
        print( sol(M.CLmax))
        plt.plot(sol(M.Srunway),sol(M.aircraft.mass))
        M = Mission("blownwing") 
        M.substitutions.update({M.Srunway:('sweep',range_sweep)})
        M.cost = M.aircraft.mass
-       sol = M.localsolve(solver='cvxopt',skipsweepfailures=True)
+       sol = M.localsolve(solver=get_solver(),skipsweepfailures=True)
        print( sol(M.CLmax))
        plt.plot(sol(M.Srunway),sol(M.aircraft.mass))
 
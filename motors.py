@@ -0,0 +1,162 @@
+" motor catalogue fits for the Powertrain model "
+import hashlib
+import json
+import os
+from functools import lru_cache
+import numpy as np
+from gpkit import units
+from fits import CACHE_DIR, load_table
+
+#pylint: disable=invalid-name
+
+# motors.csv is synthetic: its rows are sampled from the magicALL fits
+# below, so it exercises the fitting rather than describing real motors
+MOTORS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                      "motors.csv")
+
+# catalogue columns: motor mass [kg], continuous and peak power [kW],
+# maximum rpm and efficiency
+MASS = "m_kg"
+# monomials y = c*m**e, fit together by one log-space least squares
+MONOMIALS = ("RPM_max", "eta")
+# specific powers P/m = sum_k c_k*m**e_k [W/kg] with the exponents below
+POSYNOMIALS = {"P_cont_kW": (1, 0), "P_peak_kW": (1, 0)}
+
+class MotorFit(object):
+    """ fitted catalogue relations, as gpkit expressions of motor mass
+
+    coeffs maps each column to its (c, e) pairs and error to the rms and
+    worst log error of its fit over the catalogue (log error ~ relative
+    error), or is None for built-in coefficients.
+    """
+    def __init__(self, coeffs, error=None, n=0):
+        self.coeffs = coeffs
+        self.error = error
+        self.n = n
+
+    def _sum(self, col, m):
+        return sum(c*(m/units("kg"))**e if e else c
+                   for c, e in self.coeffs[col])
+
+    def specific_power(self, m, peak=False):
+        " continuous (or peak) power per unit mass [W/kg] "
+        return self._sum("P_peak_kW" if peak else "P_cont_kW", m)*units("W/kg")
+
+    def rpm(self, m):
+        " maximum rpm "
+        return self._sum("RPM_max", m)*units("rpm")
+
+    def efficiency(self, m):
+        " motor efficiency "
+        return self._sum("eta", m)
+
+    def report(self):
+        " one line per relation with its coefficients and fit error "
+        lines = []
+        for col in MONOMIALS + tuple(POSYNOMIALS):
+            terms = " + ".join("%.4g*m^%.4g" % ce for ce in self.coeffs[col])
+            if self.error is None:
+                lines.append("%-10s %s" % (col, terms))
+                continue
+            lines.append("%-10s %-28s rms %.2g%%  max %.2g%%" % (
+                col, terms, 100*self.error[col][0], 100*self.error[col][1]))
+        return "\n".join(lines)
+
+    def to_dict(self):
+        " json-friendly coefficients "
+        return {"coeffs": self.coeffs, "error": self.error, "n": self.n}
+
+    @classmethod
+    def from_dict(cls, d):
+        " inverse of to_dict "
+        return cls(dict((k, [tuple(ce) for ce in v])
+                        for k, v in d["coeffs"].items()),
+                   dict((k, tuple(v)) for k, v in d["error"].items()), d["n"])
+
+# built-in magicALL motor fits, used when no catalogue is configured;
+# motors.csv is sampled from them
+MAGICALL = MotorFit({"P_cont_kW": [(61.8, 1), (6290, 0)],
+                     "P_peak_kW": [(86.2, 1), (7860, 0)],
+                     "RPM_max": [(7939, -0.201)],
+                     "eta": [(0.906, 0.0134)]})
+
+def _errors(logy, logfit):
+    r = logfit - logy
+    return float(np.sqrt(np.mean(r**2))), float(np.abs(r).max())
+
+def fit_monomials(m, Y):
+    """ c, e of y = c*m**e for each column of Y
+
+    All columns share the design matrix [1, log m], so one least-squares
+    solve in log space fits them together.
+    """
+    X = np.column_stack([np.ones(len(m)), np.log(m)])
+    logY = np.log(Y)
+    B = np.linalg.lstsq(X, logY, rcond=None)[0]
+    return np.exp(B[0]), B[1], [_errors(logY[:, j], X.dot(B[:, j]))
+                                for j in range(Y.shape[1])]
+
+def fit_posynomial(m, y, exps):
+    """ positive c_k of y = sum_k c_k*m**e_k, least squares in log space
+
+    Seeded by the relative-error linear fit; the coefficients are fitted
+    as logs so they stay positive.
+    """
+    from scipy.optimize import least_squares
+    X = np.column_stack([m**e for e in exps])
+    c0 = np.linalg.lstsq(X/y[:, None], np.ones(len(y)), rcond=None)[0]
+    c0 = np.maximum(c0, 1e-6*np.abs(c0).max())
+    res = least_squares(lambda p: np.log(X.dot(np.exp(p))) - np.log(y),
+                        np.log(c0))
+    c = np.exp(res.x)
+    return c, _errors(np.log(y), np.log(X.dot(c)))
+
+def fit(cols):
+    " MotorFit of a catalogue's columns "
+    m = cols[MASS]
+    coeffs, error = {}, {}
+    c, e, errs = fit_monomials(m, np.column_stack([cols[k]
+                                                   for k in MONOMIALS]))
+    for j, col in enumerate(MONOMIALS):
+        coeffs[col] = [(float(c[j]), float(e[j]))]
+        error[col] = errs[j]
+    for col, exps in POSYNOMIALS.items():
+        c, error[col] = fit_posynomial(m, cols[col]*1e3/m, exps)
+        coeffs[col] = [(float(ck), float(ek)) for ck, ek in zip(c, exps)]
+    return MotorFit(coeffs, error, len(m))
+
+def catalogue(path=MOTORS, cachedir=CACHE_DIR):
+    """ fitted relations of a motor catalogue table (.csv or .xlsx)
+
+    Fits are kept per file version in memory and by a hash of the data on
+    disk, so a new catalogue is refit once and then reused.
+    """
+    st = os.stat(path)
+    return _catalogue(os.path.abspath(path), st.st_mtime, st.st_size,
+                      cachedir)
+
+@lru_cache(maxsize=None)
+def _catalogue(path, mtime, size, cachedir):
+    cols = load_table(path)
+    names = (MASS,) + MONOMIALS + tuple(POSYNOMIALS)
+    missing = [k for k in names if k not in cols]
+    if missing:
+        raise KeyError("%s has no column(s) %s" % (path, missing))
+    digest = hashlib.sha1(repr((sorted(POSYNOMIALS.items()), MONOMIALS))
+                          .encode() + b"".join(
+                              np.ascontiguousarray(cols[k]).tobytes()
+                              for k in names)).hexdigest()[:16]
+    fname = os.path.join(cachedir, "motors-%s.json" % digest)
+    if os.path.exists(fname):
+        with open(fname) as f:
+            return MotorFit.from_dict(json.load(f))
+    result = fit(cols)
+    if not os.path.isdir(cachedir):
+        os.makedirs(cachedir)
+    with open(fname, "w") as f:
+        json.dump(result.to_dict(), f)
+    return result
+
+if __name__ == "__main__":
+    import sys
+    print((catalogue(sys.argv[1]) if sys.argv[1:] else MAGICALL).report())
@@ -0,0 +1,32 @@
+" cached spanwise geometry for Planform's linked variables "
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+
+#pylint: disable=invalid-name
+
+Geometry = namedtuple("Geometry", ["eta", "cbar", "cbave", "deta", "cbarmac"])
+
+@lru_cache(maxsize=None)
+def geometry(eta, lam, taper=1.):
+    """ non-dimensional chord distribution of a half wing at nodes eta
+
+    The chord varies from 1 at the root to lam at the tip as
+    1 + (lam - 1)*eta**taper, so taper=1 is the straight (linear) taper
+    and other exponents give curved distributions. Chords are normalized
+    so the trapezoid-rule mean chord over the nodes is 1, which is exact
+    for linear taper. eta is a tuple of the nodes' 2y/b from 0 to 1.
+    Results are cached and their arrays read-only, so every Planform with
+    the same (eta, lam, taper) shares one copy.
+    """
+    eta = np.array(eta, dtype=float)
+    deta = np.diff(eta)
+    c = 1 + (lam - 1)*eta**taper
+    cbar = c/((c[:-1] + c[1:])/2*deta).sum()
+    cbave = (cbar[:-1] + cbar[1:])/2
+    r = cbar[1:]/cbar[:-1]
+    maci = 2./3*cbar[:-1]*(1 + r + r**2)/(1 + r)
+    cbarmac = (cbave*maci*deta).sum()/(cbave*deta).sum()/cbar[0]
+    for a in (eta, deta, cbar, cbave):
+        a.flags.writeable = False
+    return Geometry(eta, cbar, cbave, deta, float(cbarmac))
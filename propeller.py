@@ -0,0 +1,87 @@
+" propeller performance map model "
+from numpy import pi
+from gpkit import Model, parse_variables
+from fits import Fit, registry, get_fit
+
+#pylint: disable=invalid-name
+
+def load_map(path, K=3, ftype="MA", sheet=None):
+    """ register a tabulated propeller map with the fit registry
+
+    The table needs columns J (advance ratio), M_tip (helical tip Mach),
+    C_T (thrust coefficient T/(rho n^2 D^4)) and C_P (power coefficient
+    P/(rho n^3 D^5)). 1/C_T is fitted so the map bounds thrust from above
+    and C_P so it bounds shaft power from below.
+    """
+    registry.register("prop_ct", path, ("J", "M_tip"), "C_T", K=K,
+                      ftype=ftype, sheet=sheet, invert=True)
+    registry.register("prop_cp", path, ("J", "M_tip"), "C_P", K=K,
+                      ftype=ftype, sheet=sheet)
+
+# built-in map: fits of propmap.csv, a sample fixed-pitch propeller with
+# peak efficiency 0.8 at J = 0.6; load_map replaces them with a real map
+registry.default("prop_ct", Fit.from_monomials(
+    [26.1323, 68.5214, 12.3351],
+    [[1.012623, 0.054660],
+     [3.384860, 0.054660],
+     [0.123576, 0.054660]]))
+registry.default("prop_cp", Fit.from_monomials(
+    [0.057246], [[-0.079245, 0.117239]]))
+
+class Propeller(Model):
+    """ Propeller
+
+    Variables
+    ---------
+    D                   [m]         propeller diameter
+
+    """
+    @parse_variables(__doc__, globals())
+    def setup(self, powertrain):
+        self.powertrain = powertrain
+        return [D == 2*powertrain.r]
+
+    def dynamic(self, state, T, P, n_active, eta_prop):
+        return PropellerP(self, state, T, P, n_active, eta_prop)
+
+class PropellerP(Model):
+    """ Propeller performance from the fitted efficiency/thrust map
+
+    Variables
+    ---------
+    J                   [-]         advance ratio V/(n*D)
+    M_tip               [-]         helical tip Mach number
+    RPM                 [rpm]       propeller speed
+    C_Tp                [-]         thrust coefficient
+    C_Pp                [-]         power coefficient
+    a           343     [m/s]       speed of sound
+    M_max       0.75    [-]         tip Mach limit of the map data
+
+    LaTex Strings
+    -------------
+    M_tip       M_{\\mathrm{tip}}
+    M_max       M_{\\mathrm{max}}
+    C_Tp        C_{T_{\\mathrm{prop}}}
+    C_Pp        C_{P_{\\mathrm{prop}}}
+
+    """
+    @parse_variables(__doc__, globals())
+    def setup(self, prop, state, T, P, n_active, eta_prop):
+        r = prop.powertrain.r
+        D = prop.D
+        rho = state.rho
+        # rpm converts to rad/s, so RPM*r is tip speed and n = RPM/(2*pi)
+        # prop speed is held to the map range rather than the motor RPMmax,
+        # i.e. a reduction drive is assumed where the two differ
+        n = RPM/(2*pi)
+        constraints = [
+            J == pi*state.V/(RPM*r),
+            M_tip**2 >= (state.V**2 + (RPM*r)**2)/a**2,
+            M_tip <= M_max,
+            T/n_active <= C_Tp*rho*n**2*D**4,
+            P*prop.powertrain.eta >= n_active*C_Pp*rho*n**3*D**5,
+            eta_prop*C_Pp <= J*C_Tp,
+            get_fit("prop_ct").constraints(1/C_Tp, J, M_tip),
+            get_fit("prop_cp").constraints(C_Pp, J, M_tip),
+            ]
+        return constraints
@@ -0,0 +1,120 @@
+" discrete propeller-count search with parallel branch solves "
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import time
+from gpkit import ureg
+from cases import build
+from solvers import get_solver
+
+#pylint: disable=invalid-name
+
+W_FUSE = 50*ureg("in")      # fuselage width taken out of the prop span
+R_MIN = 0.1*ureg("m")       # smallest propeller radius the models allow
+SPAN = "aircraft.bw.wing.planform.b"
+N_PROP = "aircraft.bw.n_prop"
+# active propeller counts of the scheduled segments, e.g. for a cruise
+# shut-down search: search(range(2, 11, 2), path=ACTIVE % "cruise")
+ACTIVE = "%s.perf.bw_perf.n_active"
+# branches solved at once by default: the middle count and its neighbours
+# are enough to see which way cost falls, so later branches can be pruned
+WINDOW = 3
+
+def span_feasible(n_prop, b_max, r_min=R_MIN, w_fuse=W_FUSE):
+    " cheap bound: can n_prop discs of radius r_min fit in span b_max [ft] "
+    return (w_fuse + n_prop*2*r_min).to("ft").magnitude <= b_max
+
+def center_out(counts):
+    " counts ordered from the middle of the range outward "
+    counts = sorted(counts)
+    mid = (len(counts) - 1)//2
+    return sorted(counts, key=lambda n: (abs(counts.index(n) - mid),
+                                         counts.index(n)))
+
+def dominated(n, done):
+    """ True if finished branches show n cannot beat the incumbent
+
+    Assumes cost is unimodal in n_prop: once cost rises between two solved
+    counts, every count further out in that direction is dominated.
+    """
+    solved = sorted((m, c) for m, c in done.items() if c is not None)
+    for (n1, c1), (n2, c2) in zip(solved[:-1], solved[1:]):
+        if c2 > c1 and n > n2:
+            return True
+        if c1 > c2 and n < n1:
+            return True
+    return False
+
+def solve_branch(n_prop, wingmode="blownwing", substitutions=None,
+                 cost="range", solver=None, path=N_PROP):
+    " solve one propeller-count branch; runs in a worker process "
+    subs = dict(substitutions or {})
+    subs[path] = n_prop
+    start = time.time()
+    M = build(wingmode, subs, cost)
+    try:
+        sol = M.localsolve(get_solver(solver), verbosity=0)
+    except Exception as e:
+        return n_prop, None, str(e), time.time() - start
+    return n_prop, sol, None, time.time() - start
+
+def search(n_range=range(2, 17, 2), wingmode="blownwing", substitutions=None,
+           cost="range", solver=None, max_workers=None, prune=True,
+           path=N_PROP):
+    """ best propeller count over n_range
+
+    path is the count searched: n_prop by default, or a segment's active
+    propellers (see ACTIVE) with n_prop fixed by substitutions. Branches
+    are solved in parallel processes, at most max_workers (default
+    WINDOW) at a time, starting from the middle of n_range and working
+    outward. Counts that cannot fit in a fixed span are skipped up front,
+    and with prune=True a branch is not started once finished ones show
+    it is dominated; a larger max_workers trades pruning for parallelism.
+
+    Returns (n_best, sol_best, report) where report maps each count to a
+    dict with its cost (None if not solved), status and solve time.
+    """
+    report = {}
+    solver = get_solver(solver)
+    b_max = (substitutions or {}).get(SPAN)
+    branches = []
+    for n in n_range:
+        if (path == N_PROP and b_max is not None
+                and not span_feasible(n, b_max)):
+            report[n] = {"cost": None, "status": "pruned: span", "time": 0.}
+        else:
+            branches.append(n)
+
+    done, sols = {}, {}
+    queue = center_out(branches)
+    workers = max_workers or WINDOW
+    with ProcessPoolExecutor(workers) as pool:
+        running = set()
+        while queue or running:
+            while queue and len(running) < workers:
+                n = queue.pop(0)
+                if prune and dominated(n, done):
+                    report[n] = {"cost": None, "status":
+                                 "pruned: dominated", "time": 0.}
+                    continue
+                running.add(pool.submit(solve_branch, n, wingmode,
+                                        substitutions, cost, solver, path))
+            finished, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                n, sol, err, dt = fut.result()
+                done[n] = None if sol is None else float(sol["cost"])
+                report[n] = {"cost": done[n], "status": err or "solved",
+                             "time": dt}
+                if sol is not None:
+                    sols[n] = sol
+
+    if not sols:
+        return None, None, report
+    n_best = min(sols, key=lambda n: done[n])
+    return n_best, sols[n_best], report
+
+if __name__ == "__main__":
+    n_best, sol, report = search()
+    for n in sorted(report):
+        print(n, report[n])
+    print("best n_prop:", n_best)
+    if sol is not None:
+        print(sol.table())
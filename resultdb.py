@@ -0,0 +1,137 @@
+" SQLite database of solved designs with indexed key outputs "
+import json
+import sqlite3
+import time
+import zlib
+import numpy as np
+from diagnose import plainkey
+from resultsink import OUTPUTS, record
+
+#pylint: disable=invalid-name
+
+COLUMNS = [name for name, _, _ in OUTPUTS]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    wingmode    TEXT,
+    cost        TEXT,
+    status      TEXT,
+    time        REAL,
+    created     REAL,
+    %s,
+    inputs      TEXT,
+    variables   BLOB,
+    sensitivities BLOB
+);
+""" % ",\n    ".join("%-11s REAL" % c for c in COLUMNS)
+SCHEMA += "".join("CREATE INDEX IF NOT EXISTS runs_%s ON runs (%s);\n"
+                  % (c, "wingmode, " + c) for c in COLUMNS)
+SCHEMA += "CREATE INDEX IF NOT EXISTS runs_wingmode ON runs (wingmode);\n"
+
+def _pack(d):
+    return zlib.compress(json.dumps(d).encode())
+
+def _unpack(blob):
+    return json.loads(zlib.decompress(blob)) if blob is not None else None
+
+def _vector(section):
+    " plain name -> [value(s), units] for a solution KeyDict "
+    out = {}
+    for vk, v in section.items():
+        v = np.asarray(getattr(v, "magnitude", v), dtype=float)
+        out[plainkey(vk)] = [v.tolist(), vk.unitstr()]
+    return out
+
+class ResultDB(object):
+    """ one row per solve: inputs, key outputs, variables, sensitivities
+
+    The key outputs of resultsink.OUTPUTS (R [nmi], mass [kg], battery_m
+    [kg], Srunway [m]) are columns indexed together with the wing mode,
+    so range queries on them need no scan. The full variable vector and
+    constant sensitivities are stored compressed and read per run.
+    """
+    def __init__(self, path="results.db"):
+        self.db = sqlite3.connect(path, timeout=60.)
+        self.db.executescript(SCHEMA)
+
+    def add(self, M, sol, inputs=None, dt=None, wingmode=None, cost=None):
+        " store a solved Mission; returns the run id "
+        case = getattr(M, "case", {})
+        rec = record(M, sol, inputs or case.get("substitutions", {}),
+                     "solved", dt)
+        return self.add_record(
+            rec, wingmode or case.get("wingmode") or M.wingmode,
+            cost or case.get("cost"),
+            _vector(sol["variables"]),
+            _vector(sol["sensitivities"]["variables"]))
+
+    def add_record(self, rec, wingmode, cost=None, variables=None,
+                   sensitivities=None):
+        " store a resultsink/jobqueue record, e.g. from an earlier run "
+        outputs = rec.get("outputs", {})
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO runs (wingmode, cost, status, time, created, %s,"
+                " inputs, variables, sensitivities) VALUES (%s)"
+                % (", ".join(COLUMNS), ", ".join("?"*(len(COLUMNS) + 8))),
+                [wingmode, cost, rec.get("status"), rec.get("time"),
+                 time.time()] + [outputs.get(c) for c in COLUMNS]
+                + [json.dumps(rec.get("inputs", {})),
+                   _pack(variables) if variables else None,
+                   _pack(sensitivities) if sensitivities else None])
+        return cur.lastrowid
+
+    def find(self, wingmode=None, status="solved", **ranges):
+        """ runs matching a wing mode and ranges on the output columns
+
+        Ranges are (low, high) tuples with None for an open end, e.g.
+        find("blownwing", R=(60, None), Srunway=(None, 80)). Returns dicts
+        of the indexed columns plus id and inputs, by id.
+        """
+        where, args = [], []
+        if wingmode is not None:
+            where.append("wingmode = ?")
+            args.append(wingmode)
+        if status is not None:
+            where.append("status = ?")
+            args.append(status)
+        for c, (lo, hi) in ranges.items():
+            if c not in COLUMNS:
+                raise KeyError("%s is not a result column; use one of %s"
+                               % (c, COLUMNS))
+            if lo is not None:
+                where.append("%s > ?" % c)
+                args.append(lo)
+            if hi is not None:
+                where.append("%s < ?" % c)
+                args.append(hi)
+        fields = ["id", "wingmode", "cost"] + COLUMNS + ["inputs"]
+        sql = "SELECT %s FROM runs" % ", ".join(fields)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = []
+        for row in self.db.execute(sql + " ORDER BY id", args):
+            d = dict(zip(fields, row))
+            d["inputs"] = json.loads(d["inputs"])
+            rows.append(d)
+        return rows
+
+    def variables(self, run_id):
+        " plain variable name -> [value, units] for a run "
+        return _unpack(self.db.execute(
+            "SELECT variables FROM runs WHERE id = ?", (run_id,)).fetchone()[0])
+
+    def sensitivities(self, run_id):
+        " plain constant name -> [sensitivity, units] for a run "
+        return _unpack(self.db.execute(
+            "SELECT sensitivities FROM runs WHERE id = ?",
+            (run_id,)).fetchone()[0])
+
+    def close(self):
+        self.db.close()
+
+if __name__ == "__main__":
+    db = ResultDB()
+    for run in db.find("blownwing", R=(60, None), Srunway=(None, 80)):
+        print(run)
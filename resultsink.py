@@ -0,0 +1,184 @@
+" streaming NDJSON result sink for long batch runs "
+import json
+import os
+import time
+from cases import resolve
+from solvers import get_solver, timed_solve
+from diagnose import diagnose as relax_diagnose
+
+#pylint: disable=invalid-name
+
+# key outputs recorded for every solved point: name, model path, units
+OUTPUTS = [("R", "R", "nmi"),
+           ("mass", "aircraft.mass", "kg"),
+           ("battery_m", "aircraft.battery.m", "kg"),
+           ("Srunway", "Srunway", "m")]
+
+class NDJSONSink(object):
+    """ one JSON line per point, on disk as soon as it is written
+
+    Next to `path` an index file (path + ".idx") gets one tab-separated
+    "case_id offset" line per record, so readers can seek straight to a
+    case. Reopening an existing sink appends to it; a torn last line left
+    by a crash is cut off first, so new records start on a fresh line.
+    """
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.idxpath = path + ".idx"
+        self.fsync = fsync
+        rebuild = os.path.exists(path) and not os.path.exists(self.idxpath)
+        _truncate_torn(path)
+        _truncate_torn(self.idxpath)
+        self.index = load_index(path)
+        self._out = open(path, "ab")
+        self._idx = open(self.idxpath, "a")
+        if rebuild:
+            for case_id, offset in sorted(self.index.items(),
+                                          key=lambda kv: kv[1]):
+                self._idx.write("%s\t%d\n" % (case_id, offset))
+            self._flush(self._idx)
+
+    def write(self, case_id, record):
+        " append a record; the data line is flushed before its index line "
+        line = json.dumps(dict(record, id=case_id), default=float)
+        self._out.seek(0, os.SEEK_END)
+        offset = self._out.tell()
+        self._out.write((line + "\n").encode())
+        self._flush(self._out)
+        self._idx.write("%s\t%d\n" % (case_id, offset))
+        self._flush(self._idx)
+        self.index[str(case_id)] = offset
+
+    def _flush(self, f):
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def close(self):
+        self._out.close()
+        self._idx.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def _truncate_torn(path):
+    " cut an unterminated last line off the file at path, if any "
+    if not os.path.exists(path):
+        return
+    with open(path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        pos = end
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            nl = chunk.rfind(b"\n")
+            if nl >= 0:
+                pos = pos - step + nl + 1
+                break
+            pos -= step
+        if pos < end:
+            f.truncate(pos)
+
+def load_index(path):
+    """ case_id -> byte offset; rebuilt from the data if the index is missing
+
+    Unterminated or unparseable lines are skipped, so one damaged record
+    does not hide the cases written after it.
+    """
+    index = {}
+    if os.path.exists(path + ".idx"):
+        with open(path + ".idx") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    continue
+                case_id, _, offset = line.rstrip("\n").rpartition("\t")
+                if case_id and offset.isdigit():
+                    index[case_id] = int(offset)
+        return index
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.endswith(b"\n"):
+                    try:
+                        index[str(json.loads(line)["id"])] = offset
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                offset += len(line)
+    return index
+
+def read_case(path, case_id, index=None):
+    " record for case_id, read by seeking to its indexed offset "
+    index = load_index(path) if index is None else index
+    with open(path, "rb") as f:
+        f.seek(index[str(case_id)])
+        return json.loads(f.readline())
+
+def iter_records(path):
+    " all complete records in order; torn or unparseable lines are skipped "
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+def record(M, sol, inputs, status, dt):
+    " sink record for one solve; sol is None if it failed "
+    outputs = {}
+    if sol is not None:
+        for name, path, unit in OUTPUTS:
+            outputs[name] = float(sol(resolve(M, path)).to(unit).magnitude)
+    return {"inputs": inputs, "outputs": outputs, "status": status,
+            "time": dt}
+
+def run_sweep(M, path, values, sink, ids=None, solver=None,
+              diagnose=False, budget=None):
+    """ solve M at each value of the variable at `path`, streaming results
+
+    Points are solved one at a time and written as they finish, so a crash
+    loses at most the point in progress. Case ids default to the point
+    index; ids already in the sink's index are skipped, which resumes an
+    interrupted run. With diagnose=True a failed point of a cases.build
+    Mission is also run through the relaxation diagnostics and the result
+    stored under "diagnosis". A per-point budget [s] caps the solve time
+    (solvers.timed_solve); points cut short are "solved, not converged".
+    """
+    var = resolve(M, path)
+    solver = get_solver(solver)
+    ids = [str(i) for i in (ids or range(len(values)))]
+    for case_id, value in zip(ids, values):
+        if case_id in sink.index:
+            continue
+        M.substitutions.update({var: value})
+        start = time.time()
+        try:
+            if budget is None:
+                sol, status = M.localsolve(solver, verbosity=0), "solved"
+            else:
+                sol, converged = timed_solve(M, budget, solver=solver)
+                status = "solved" if converged else "solved, not converged"
+        except Exception as e:
+            sol, status = None, "%s: %s" % (type(e).__name__, e)
+        rec = record(M, sol, {path: value}, status, time.time() - start)
+        if sol is None and diagnose and hasattr(M, "case"):
+            subs = dict(M.case["substitutions"], **{path: value})
+            rec["diagnosis"] = [dict(d, groups=list(d["groups"])) for d in
+                                relax_diagnose(M.case["wingmode"], subs,
+                                               solver=solver)]
+        sink.write(case_id, rec)
+
+if __name__ == "__main__":
+    from cases import build
+    M = build("na", cost="mass")
+    with NDJSONSink("runway_sweep.ndjson") as sink:
+        run_sweep(M, "Srunway", [50, 100, 200, 300, 500], sink)
+    for rec in iter_records("runway_sweep.ndjson"):
+        print(rec["id"], rec["status"], rec["outputs"])
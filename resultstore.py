@@ -0,0 +1,129 @@
+" memory-mapped result arrays shared between processes "
+import json
+import os
+import numpy as np
+from cases import resolve
+from resultsink import iter_records, OUTPUTS
+
+#pylint: disable=invalid-name
+
+class ArrayStore(object):
+    """ solved results for n cases in one memory-mapped float64 array
+
+    The store at `path` is a raw data file plus `path + ".json"`, which maps
+    each variable name to its (offset, size, units) block of rows. Row block
+    `offset:offset+size` holds that variable for all cases, so every
+    variable is a contiguous slice and readers in other processes get
+    zero-copy views of the same pages. Cases not yet written are NaN.
+    Put the file under /dev/shm for a store that lives only in memory.
+    """
+    def __init__(self, path, mode="r"):
+        with open(path + ".json") as f:
+            meta = json.load(f)
+        self.path = path
+        self.n = meta["n"]
+        self.columns = dict((name, tuple(c)) for name, c in
+                            meta["columns"].items())
+        width = sum(size for _, size, _ in self.columns.values())
+        self.data = np.memmap(path, np.float64, mode, shape=(width, self.n))
+
+    @classmethod
+    def create(cls, path, columns, n):
+        " new store for columns [(name, size, units)] and n cases "
+        if n < 1:
+            raise ValueError("a store needs at least one case, got %s" % n)
+        offset, layout = 0, {}
+        for name, size, units in columns:
+            layout[name] = (offset, size, units)
+            offset += size
+        data = np.memmap(path, np.float64, "w+", shape=(offset, n))
+        data[:] = np.nan
+        data.flush()
+        del data
+        with open(path + ".json", "w") as f:
+            json.dump({"n": n, "columns": layout}, f)
+        return cls(path, "r+")
+
+    def __getitem__(self, name):
+        " (n,) view for a scalar variable, (size, n) for a vector "
+        offset, size, _ = self.columns[name]
+        block = self.data[offset:offset + size]
+        return block[0] if size == 1 else block
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def get(self, name, default=None):
+        " dict-style access, so a store can stand in for a results dict "
+        return self[name] if name in self.columns else default
+
+    def units(self, name):
+        return self.columns[name][2]
+
+    def done(self):
+        " mask of cases that have been written "
+        return ~np.isnan(self.data).all(axis=0)
+
+    def put(self, i, values):
+        " write case i from a dict name -> value in the column's units "
+        for name, value in values.items():
+            offset, size, _ = self.columns[name]
+            self.data[offset:offset + size, i] = np.ravel(value)
+
+    def flush(self):
+        self.data.flush()
+
+def columns_for(M, sol, paths):
+    " (name, size, units) for the variables at dotted `paths` of M "
+    columns = []
+    for path in paths:
+        q = sol(resolve(M, path))
+        units = str(q.units) if hasattr(q, "units") else ""
+        columns.append((path, int(np.size(q)), units))
+    return columns
+
+def solution_values(M, sol, columns):
+    " values of a solution for store.put, converted to the columns' units "
+    values = {}
+    for path, _, units in columns:
+        q = sol(resolve(M, path))
+        values[path] = q.to(units).magnitude if units else q
+    return values
+
+def from_ndjson(path, store_path):
+    """ store of every numeric input and output in an NDJSON sink file
+
+    Cases are stored in file order; "id" holds numeric case ids and
+    failed cases stay NaN apart from their inputs. Outputs keep the units
+    they were recorded in (resultsink.OUTPUTS). A sink with no complete
+    records raises ValueError.
+    """
+    records = list(iter_records(path))
+    if not records:
+        raise ValueError("%s has no complete records to store" % path)
+    units = dict((name, unit) for name, _, unit in OUTPUTS)
+    names = []
+    for rec in records:
+        for name in list(rec["inputs"]) + list(rec["outputs"]):
+            if name not in names:
+                names.append(name)
+    store = ArrayStore.create(store_path, [("id", 1, "")]
+                              + [(name, 1, units.get(name, ""))
+                                 for name in names],
+                              len(records))
+    for i, rec in enumerate(records):
+        values = dict(rec["inputs"], **rec["outputs"])
+        try:
+            values["id"] = float(rec["id"])
+        except ValueError:
+            pass
+        store.put(i, dict((k, v) for k, v in values.items()
+                          if isinstance(v, (int, float))))
+    store.flush()
+    return store
+
+if __name__ == "__main__":
+    if os.path.exists("runway_sweep.ndjson"):
+        store = from_ndjson("runway_sweep.ndjson", "runway_sweep.dat")
+        for name in store.columns:
+            print(name, store[name])
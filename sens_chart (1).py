@@ -5,6 +5,7 @@ import numpy as np
 from numpy import random
 from gpkit.repr_conventions import unitstr
 from mission import Mission
+from solvers import get_solver
 
 #pylint: disable=invalid-name, anomalous-backslash-in-string
 
@@ -100,7 +101,7 @@ def test():
     " test for integrated testing "
     model = Mission(latitude=[20])
     model.cost = model[model.solar.Wtotal]
-    result = model.solve("mosek")
+    result = model.solve(get_solver())
     _ = get_highestsens(model, result)
 
     vn = {model.solar.Wpay: "$W_{\\mathrm{pay}}$",
@@ -111,7 +112,7 @@ if __name__ == "__main__":
 
     M = Mission()
     M.cost = M[M.aircraft.m]
-    sol = M.solve("mosek")
+    sol = M.solve(get_solver())
 
     sd = get_highestsens(M, sol, N=15)
     f, a = plot_chart(sd)
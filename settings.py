@@ -0,0 +1,199 @@
+" named model settings: layered files applied to cached Mission templates "
+from functools import lru_cache
+import json
+import os
+from gpkit.units import DimensionalityError, Quantity
+from cases import COSTS, resolve
+from mission import Mission
+from solvers import get_solver
+
+#pylint: disable=invalid-name
+
+SITE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                    "model_settings.json")
+
+# every flight state of the mission, for settings that hold in all of them
+STATES = ("takeoff.fs", "obstacle_climb.flightstate", "climb.flightstate",
+          "cruise.flightstate", "cruise.loadstate", "landing.perf.fs")
+
+# setting name -> (units of its values, model paths from the Mission)
+SETTINGS = {
+    "battery_Estar":  ("Wh/kg", ("aircraft.battery.Estar",)),
+    "battery_eta":    ("", ("aircraft.battery.eta_pack",)),
+    "battery_Pcont":  ("W/kg", ("aircraft.battery.P_max_cont",)),
+    "battery_Pburst": ("W/kg", ("aircraft.battery.P_max_burst",)),
+    "power_margin":   ("", ("aircraft.bw.powertrain.P_margin",)),
+    "n_plies":        ("", ("aircraft.bw.wing.n_plies",)),
+    "n_pax":          ("", ("aircraft.n_pax",)),
+    "mpax":           ("kg", ("aircraft.mpax",)),
+    "mbaggage":       ("kg", ("aircraft.mbaggage",)),
+    "Vstall":         ("kts", ("Vstall",)),
+    "Vne":            ("kts", tuple(s + ".Vne" for s in STATES)),
+    "planform_tau":   ("", ("aircraft.bw.wing.planform.tau",)),
+    "planform_lam":   ("", ("aircraft.bw.wing.planform.lam",)),
+    "n_prop":         ("", ("aircraft.bw.n_prop",)),
+    "AR":             ("", ("aircraft.bw.wing.planform.AR",)),
+    "b":              ("ft", ("aircraft.bw.wing.planform.b",)),
+    "V_h":            ("", ("aircraft.htail.Vh",)),
+    "V_v":            ("", ("aircraft.vtail.Vv",)),
+    "l_fus":          ("m", ("aircraft.fuselage.l",)),
+    "w_fus":          ("m", ("aircraft.fuselage.w",)),
+    "h_fus":          ("m", ("aircraft.fuselage.h",)),
+    "C_Lmax":         ("", ("CLmax",)),
+    "C_D0":           ("", ("cruise.perf.bw_perf.C_D",)),
+    "e":              ("", ("cruise.perf.bw_perf.e",)),
+    "V_cruise":       ("kts", ("cruise.flightstate.V",)),
+    "m_batt":         ("kg", ("aircraft.battery.m",)),
+    "E_batt":         ("kWh", ("aircraft.battery.E_capacity",)),
+    "eta":            ("", ("aircraft.bw.powertrain.eta",)),
+    "rho":            ("kg/m^3", ("cruise.flightstate.rho",)),
+    "mu":             ("kg/m/s", ("cruise.flightstate.mu",)),
+}
+# other names for the same settings, e.g. the InputsTab fields
+ALIASES = {"tau": "planform_tau", "lam": "planform_lam", "V_stall": "Vstall",
+           "E_Star": "battery_Estar", "b_eta": "battery_eta"}
+# keys of a settings file that are not model settings (solver: solvers.py)
+SKIP = ("solver",)
+
+def canonical(name):
+    " setting name behind an alias; KeyError for unknown names "
+    name = ALIASES.get(name, name)
+    if name not in SETTINGS:
+        raise KeyError("unknown setting %s; use one of %s"
+                       % (name, sorted(SETTINGS) + sorted(ALIASES)))
+    return name
+
+def quantity(name, value):
+    """ validated value of a setting
+
+    Numbers (or numeric strings) are in the setting's units; strings with
+    units, e.g. "250 Wh/kg", are converted to them and must match their
+    dimension.
+    """
+    unit = SETTINGS[canonical(name)][0]
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            value = Quantity(value.strip())
+    if not hasattr(value, "units"):
+        return Quantity(float(value), unit)
+    try:
+        return value.to(unit)
+    except DimensionalityError:
+        raise ValueError("setting %s: %s is not in units of %s"
+                         % (name, value, unit or "dimensionless"))
+
+def load(*layers):
+    """ merged setting values of files or dicts, later layers winning
+
+    e.g. load(SITE, "case.json", {"n_prop": 8}) for site defaults with a
+    case's overrides. Values are validated and converted to quantities;
+    keys starting with "_" and those in SKIP are ignored.
+    """
+    values = {}
+    for layer in layers:
+        if isinstance(layer, str):
+            with open(layer) as f:
+                layer = json.load(f)
+        for name, value in layer.items():
+            if name.startswith("_") or name in SKIP:
+                continue
+            values[canonical(name)] = quantity(name, value)
+    return values
+
+def variables(M, name):
+    " model variables a setting sets in M "
+    return [resolve(M, path) for path in SETTINGS[canonical(name)][1]]
+
+def variable(M, name):
+    " model variable of a setting that sets a single variable "
+    vs = variables(M, name)
+    if len(vs) != 1:
+        raise ValueError("setting %s sets %i variables" % (name, len(vs)))
+    return vs[0]
+
+def substitutions(M, values):
+    " {model variable: value} of validated setting values for M "
+    subs = {}
+    for name, value in values.items():
+        for v in variables(M, name):
+            vunits = v.key.units
+            try:
+                subs[v] = value.to(vunits) if vunits else \
+                    value.to("dimensionless").magnitude
+            except DimensionalityError:
+                raise ValueError("setting %s: %s does not convert to %s's "
+                                 "units" % (name, value, v))
+    return subs
+
+def paths(values, wingmode="blownwing", **options):
+    """ {model path: value in the variable's units} of setting values
+
+    Plain data for cases.build and the batch tools (resultsink, jobqueue,
+    propsearch, cells), using a template only for the units.
+    """
+    M = template(wingmode, **options)
+    out = {}
+    for name, value in values.items():
+        for path, v in zip(SETTINGS[canonical(name)][1],
+                           variables(M, name)):
+            vunits = v.key.units
+            out[path] = float((value.to(vunits) if vunits else
+                               value.to("dimensionless")).magnitude)
+    return out
+
+@lru_cache(maxsize=None)
+def template(wingmode="blownwing", cost="range", **options):
+    """ Mission built once per wing mode, cost and Mission options
+
+    options are Mission keywords (e.g. legs=3, thermal=True); use tuples
+    for props. Templates are shared, so apply settings with solve() or
+    run(), which restore the template afterwards.
+    """
+    M = Mission(wingmode=wingmode, **options)
+    M.cost = COSTS[cost](M)
+    return M
+
+def solve(values, wingmode="blownwing", cost="range", solver=None, x0=None,
+          **options):
+    " (M, sol) of a Mission template with setting values substituted "
+    M = template(wingmode, cost, **options)
+    subs = substitutions(M, values)
+    saved = dict((v.key, M.substitutions[v]) for v in subs
+                 if v in M.substitutions)
+    M.substitutions.update(subs)
+    try:
+        return M, M.localsolve(get_solver(solver), x0=x0, verbosity=0)
+    finally:
+        for v in subs:
+            if v.key in saved:
+                M.substitutions[v] = saved[v.key]
+            else:
+                del M.substitutions[v]
+
+def run(cases, site=SITE, wingmode="blownwing", cost="range", solver=None,
+        warm=True, **options):
+    """ solve each case's settings layered over the site settings
+
+    cases are files or dicts of overrides. Yields (case, M, sol or the
+    exception) in order; with warm=True each solve starts from the last
+    successful one, which speeds up sweeps of nearby cases.
+    """
+    base = load(site) if site else {}
+    x0 = None
+    for case in cases:
+        try:
+            values = dict(base)
+            values.update(load(case))
+            M, sol = solve(values, wingmode, cost, solver, x0, **options)
+        except Exception as e:
+            yield case, template(wingmode, cost, **options), e
+            continue
+        if warm:
+            x0 = sol["freevariables"]
+        yield case, M, sol
+
+if __name__ == "__main__":
+    for name, value in sorted(load(SITE).items()):
+        print("%-15s %s" % (name, value))
@@ -0,0 +1,87 @@
+" opt-in profiling of model construction "
+from contextlib import contextmanager
+import time
+import tracemalloc
+from gpkit import Model
+
+#pylint: disable=invalid-name
+
+class Node(object):
+    " construction totals for one model path, e.g. Mission/Cruise/AircraftP "
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.time = 0.
+        self.mem = 0
+        self.children = {}
+
+    def child(self, name):
+        if name not in self.children:
+            self.children[name] = Node(name)
+        return self.children[name]
+
+    @property
+    def self_time(self):
+        " time not spent building submodels "
+        return self.time - sum(c.time for c in self.children.values())
+
+@contextmanager
+def profiled(memory=True):
+    """ record time and memory of every Model built inside the block
+
+    Yields the root Node of a tree with one node per model path; models
+    built more than once at the same place are aggregated. memory=True
+    also traces allocations (net bytes still held when each model is
+    built), which slows construction. Model.__init__ is only wrapped
+    inside the block, so nothing is measured or paid for outside it.
+    """
+    root = Node("")
+    stack = [root]
+    init = Model.__init__
+    tracing = memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+
+    def timed_init(self, *args, **kwargs):
+        node = stack[-1].child(type(self).__name__)
+        stack.append(node)
+        mem0 = tracemalloc.get_traced_memory()[0] if memory else 0
+        start = time.perf_counter()
+        try:
+            init(self, *args, **kwargs)
+        finally:
+            node.time += time.perf_counter() - start
+            if memory:
+                node.mem += tracemalloc.get_traced_memory()[0] - mem0
+            node.count += 1
+            stack.pop()
+
+    Model.__init__ = timed_init
+    try:
+        yield root
+    finally:
+        Model.__init__ = init
+        if tracing:
+            tracemalloc.stop()
+
+def report(root, min_time=0.):
+    " indented tree of the nodes below root, slowest first "
+    lines = ["%-44s %5s %10s %10s %10s"
+             % ("model", "n", "total [ms]", "self [ms]", "mem [KiB]")]
+
+    def walk(node, depth):
+        for c in sorted(node.children.values(), key=lambda c: -c.time):
+            if c.time < min_time:
+                continue
+            lines.append("%-44s %5d %10.1f %10.1f %10.0f"
+                         % ("  "*depth + c.name, c.count, 1e3*c.time,
+                            1e3*c.self_time, c.mem/1024.))
+            walk(c, depth + 1)
+    walk(root, 0)
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    from mission import Mission
+    with profiled() as tree:
+        Mission()
+    print(report(tree, min_time=1e-3))
@@ -0,0 +1,150 @@
+" GP solver backend selection "
+import json
+import os
+import time
+import gpkit
+from gpkit.exceptions import Infeasible
+
+#pylint: disable=invalid-name
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SETTINGS = os.path.join(HERE, "model_settings.json")
+CACHE = os.path.join(HERE, ".solvercache.json")
+
+# installed solvers are tried in this order when robustness matters more
+# than speed; the conic mosek interface handles badly scaled models best
+ROBUST = ("mosek_conif", "mosek_cli", "cvxopt")
+CHOICES = ("fastest", "robust")
+# GPs per localsolve in a budgeted solve
+STEP = 2
+
+def installed():
+    " GP solvers gpkit found at build time "
+    return list(gpkit.settings.get("installed_solvers", []))
+
+def setting():
+    " solver preference from model_settings.json, default 'fastest' "
+    if os.path.exists(SETTINGS):
+        with open(SETTINGS) as f:
+            return json.load(f).get("solver", "fastest")
+    return "fastest"
+
+def benchmark(solvers=None, wingmode="blownwing"):
+    """ seconds to solve the reference Mission with each solver
+
+    The reference case is the default Mission at maximum range; a solver
+    that fails on it gets None.
+    """
+    from mission import Mission
+    times = {}
+    for name in solvers or installed():
+        M = Mission(wingmode=wingmode)
+        M.cost = 1/M.R
+        start = time.time()
+        try:
+            M.localsolve(name, verbosity=0)
+            times[name] = time.time() - start
+        except Exception:
+            times[name] = None
+    return times
+
+def _benchmarks():
+    " cached benchmark, rerun when the installed solvers change "
+    key = ",".join(sorted(installed()))
+    if os.path.exists(CACHE):
+        with open(CACHE) as f:
+            cached = json.load(f)
+        if cached.get("installed") == key:
+            return cached["times"]
+    times = benchmark()
+    with open(CACHE, "w") as f:
+        json.dump({"installed": key, "times": times}, f)
+    return times
+
+def choose(prefer="fastest"):
+    """ installed solver for a preference, "fastest" or "robust"
+
+    With one solver installed it is returned without benchmarking.
+    Otherwise the reference Mission is benchmarked on first use (the
+    result is cached in .solvercache.json) and solvers that failed it are
+    skipped.
+    """
+    if prefer not in CHOICES:
+        raise ValueError("unknown solver preference %r; use one of %s"
+                         % (prefer, CHOICES))
+    names = installed()
+    if not names:
+        raise RuntimeError("no GP solver installed")
+    if len(names) == 1:
+        return names[0]
+    times = _benchmarks()
+    ok = [name for name in names if times.get(name) is not None] or names
+    if prefer == "fastest":
+        return min(ok, key=lambda name: times.get(name) or float("inf"))
+    ranked = [name for name in ROBUST if name in ok]
+    return ranked[0] if ranked else ok[0]
+
+_chosen = {}
+
+def get_solver(solver=None):
+    """ solver name for a call site
+
+    solver may be an installed solver's name, "fastest" or "robust";
+    None uses the "solver" entry of model_settings.json.
+    """
+    solver = solver or setting()
+    if solver in CHOICES:
+        if solver not in _chosen:
+            _chosen[solver] = choose(solver)
+        return _chosen[solver]
+    return solver
+
+def _loosened(reltol, loosest, frac):
+    " tolerance after a fraction frac of the budget, log-spaced "
+    frac = min(max(frac, 0.), 1.)
+    return reltol*(loosest/reltol)**frac
+
+def timed_solve(M, budget=None, iteration_limit=50, reltol=1e-4,
+                loosest=1e-2, solver=None, verbosity=0):
+    """ localsolve M within a wall-clock budget [s] and an iteration cap
+
+    M is solved in short localsolves of two GPs, each started from where
+    the last one stopped. They end when one converges, or with a last
+    localsolve that accepts whatever it reaches once the next one would
+    run past the budget (judged from the last one's time) or past
+    iteration_limit GPs. The stopping tolerance starts at reltol and
+    loosens log-linearly to `loosest` as the budget is spent, so a run
+    close to its deadline accepts a nearly converged answer.
+
+    Returns (sol, converged). converged is False unless the last two GPs
+    behind sol met reltol.
+    """
+    name = get_solver(solver)
+    start = time.time()
+    x0, gps, last = None, 0, 0.
+    while True:
+        t = time.time()
+        final = gps + STEP >= iteration_limit
+        tol = reltol
+        if budget is not None:
+            final = final or t - start + 2*last > budget
+            tol = _loosened(reltol, loosest, (t - start)/budget)
+        try:
+            sol = M.localsolve(name, verbosity=verbosity, x0=x0,
+                               reltol=1. if final else tol,
+                               iteration_limit=STEP - 1)
+            break
+        except Infeasible:
+            sp = M.program
+            # a GP that failed outright, rather than a localsolve that
+            # ran out of iterations, has no solver output
+            if final or len(sp.solver_outs) < len(sp.gps):
+                raise
+            x0 = sp.results[-1]["freevariables"]
+        gps += len(M.program.gps)
+        last = time.time() - t
+    if final and sol["warnings"].get("Slack Non-GP Constraints"):
+        raise Infeasible("signomial constraints still slack after %i GP"
+                         " solves" % (gps + len(M.program.gps)))
+    prev, cost = [out["objective"] for out in M.program.solver_outs[-2:]]
+    return sol, 0 <= (prev - cost)/(prev + cost) <= reltol
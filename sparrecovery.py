@@ -0,0 +1,50 @@
+" dense spanwise structural output recovered from a solved spar "
+import numpy as np
+
+#pylint: disable=invalid-name
+
+def cumtrapz(y, x, reverse=False):
+    " cumulative trapezoid integral of y(x) from x[0], or from x[-1] "
+    if reverse:
+        return -cumtrapz(y[::-1], x[::-1])[::-1]
+    out = np.zeros_like(y)
+    out[1:] = np.cumsum(0.5*(y[1:] + y[:-1])*np.diff(x))
+    return out
+
+def segments(values, eta, eta_nodes):
+    " piecewise-constant per-segment values (length N-1) on the grid eta "
+    i = np.clip(np.searchsorted(eta_nodes, eta, side="right") - 1, 0,
+                len(values) - 1)
+    return np.asarray(values)[i]
+
+def recover(sol, loading, n=201):
+    """ shear, moment, slope and deflection of a solved SparLoading
+
+    The optimized spar (segment I, Sy, cap width and thickness) and the
+    solved nodal load are taken from sol, and the beam equations are
+    re-integrated on n evenly spaced stations from root to tip: shear and
+    moment inward from a free tip, slope and deflection outward from a
+    clamped root. The solver's values are inequality bounds on these, so
+    the recovered ones are the actual distribution for the sized spar.
+    Returns arrays in SI units keyed as in the SparLoading model.
+    """
+    wing = loading.wing
+    spar = wing.spar
+    half = sol(wing.planform.b).to("m").magnitude/2
+    eta_nodes = sol(wing.planform.eta).magnitude
+    eta = np.linspace(0, 1, n)
+    y = eta*half
+
+    q = np.interp(eta, eta_nodes, sol(loading.q).to("N/m").magnitude)
+    E = sol(spar.material.E).to("Pa").magnitude
+    I = segments(sol(spar.I).to("m^4").magnitude, eta, eta_nodes)
+    Sy = segments(sol(spar.Sy).to("m^3").magnitude, eta, eta_nodes)
+
+    S = cumtrapz(q, y, reverse=True)
+    M = cumtrapz(S, y, reverse=True)
+    th = cumtrapz(M/(E*I), y)
+    w = cumtrapz(th, y)
+    return {"x": y, "q": q, "S": S, "M": M, "th": th, "w": w,
+            "I": I, "Sy": Sy, "sigma": M/Sy,
+            "w_cap": segments(sol(spar.w).to("m").magnitude, eta, eta_nodes),
+            "t_cap": segments(sol(spar.t).to("m").magnitude, eta, eta_nodes)}
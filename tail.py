@@ -1,10 +1,11 @@
 import numpy as np
 from numpy import pi
 from gpkit import Model, parse_variables, Variable, VectorVariable, units,Vectorize
-from beam import Beam
+from beam import Beam, column
 from gpkitmodels import g
 from tube_spar import TubeSpar
 from wing_struct import *
+from fits import get_fit
 
 class TailAero(Model):
     """Tail Aero Model
@@ -40,11 +41,7 @@ class TailAero(Model):
         mu = self.mu = state.mu
         constraints = [
             Re == V*rho*S/b/mu,
-            Cd>= 0.339937756*Re**(-0.181990628)*tau**(0.774603933),
-            Cd>= 5.446864658*Re**(-0.484866619)*tau**(0.246341522),
-            Cd>= 16.2594679*Re**(-0.539943202)*tau**(0.466384455),
-            Cd>=9.509193806*Re**(-0.482346958)*tau**(0.467466389),
-            Cd>= 218.7365501*Re**(-0.603870895)*tau**(1.312443752),
+            get_fit("tail_cd").constraints(Cd, Re, tau),
             ]
         return constraints
 
@@ -202,9 +199,8 @@ class TailBoomBending(Model):
         self.htail = htail
         self.tailboom = tailboom
 
-        Beam.qbarFun = [1e-10]*N
-        Beam.SbarFun = [1.]*N
-        beam = self.beam = Beam(N)
+        # tip force only: unit normalized shear, no distributed load
+        beam = self.beam = Beam(N, qbar=[1e-10]*N, Sbar=[1.]*N)
 
         I = tailboom.I
         tailboom.I0 = I[0]
@@ -216,6 +212,9 @@ class TailBoomBending(Model):
         CLmax = htail.planform.CLmax
         deta = tailboom.deta
         sigma = tailboom.material.sigma
+        # the boom's arrays broadcast over the load cases of a vectorized
+        # loading
+        I, Sy = column(I), column(Sy)
 
         constraints = [beam.dx == deta,
                        F >= qne*S,
@@ -0,0 +1,42 @@
+" battery cell library and pack properties "
+import json
+import pytest
+from cells import library, degradation, pack, F_STRUCT, M_BUSBAR, M_SERIES
+
+CELL = {"format": "21700", "mass": 0.07, "capacity": 4.2, "voltage": 3.6,
+        "I_cont": 45, "I_burst": 60,
+        "cycling": [[100, 0.97], [300, 0.92], [500, 0.88], [800, 0.82]]}
+
+@pytest.fixture
+def path(tmp_path):
+    p = tmp_path/"cells.json"
+    p.write_text(json.dumps({"_note": "test", "cell": CELL}))
+    return str(p)
+
+def test_library_skips_notes(path):
+    assert list(library(path)) == ["cell"]
+
+def test_pack(path):
+    p = pack("cell", S=10, P=2, path=path)
+    m_cells = 20*CELL["mass"]
+    assert p.mass == pytest.approx(m_cells*(1 + F_STRUCT) + 20*M_BUSBAR
+                                   + 10*M_SERIES)
+    assert p.E == pytest.approx(20*4.2*3.6)
+    assert p.Estar == pytest.approx(p.E/m_cells)
+    assert p.P_cont == pytest.approx(45*3.6/0.07)
+    assert p.eta_pack == pytest.approx(m_cells/p.mass)
+    assert p.retention == 1.
+    assert pack("cell", S=10, P=2, path=path) is p
+
+def test_degradation(path):
+    " capacity retention follows the cycling points and derates Estar "
+    fit = degradation("cell", path)
+    assert fit.evaluate(500)[0] == pytest.approx(0.12, rel=0.15)
+    new, old = pack("cell", path=path), pack("cell", cycles=500, path=path)
+    assert old.retention < 1
+    assert old.Estar == pytest.approx(new.Estar*old.retention)
+
+def test_library_rereads_changed_file(path):
+    with open(path, "w") as f:
+        json.dump({"cell": CELL, "other": dict(CELL, mass=0.1)}, f)
+    assert set(library(path)) == {"cell", "other"}
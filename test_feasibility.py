@@ -0,0 +1,26 @@
+" learned feasibility boundary and the GP screen "
+from feasibility import Boundary, Screen, prescreen
+
+def test_boundary_decides_by_dominance():
+    b = Boundary({"Srunway": -1})
+    b.add({"Srunway": 10}, False, ["runway"])
+    b.add({"Srunway": 50}, True)
+    assert b.check({"Srunway": 8}) == (False, ["runway"])
+    assert b.check({"Srunway": 60}) == (True, [])
+    assert b.check({"Srunway": 20}) is None
+    assert b.check({"payload": 10}) is None
+
+def test_boundary_saves(tmp_path):
+    path = str(tmp_path/"boundary.json")
+    Boundary({"Srunway": -1}, path).add({"Srunway": 10}, False, ["runway"])
+    assert Boundary({"Srunway": -1}, path).check({"Srunway": 5})[0] is False
+
+def test_screen():
+    " each Screen has its own Mission; a decided case skips the screen "
+    screen = Screen(wingmode="na")
+    assert Screen(wingmode="na").M is not screen.M
+    b = Boundary({"Srunway": -1})
+    assert prescreen({"Srunway": 100}, screen, boundary=b) == (True, [])
+    assert screen.M.Srunway.key not in screen.M.substitutions
+    screen.M = None
+    assert prescreen({"Srunway": 200}, screen, boundary=b) == (True, [])
@@ -0,0 +1,43 @@
+" fitted-model registry "
+import numpy as np
+import pytest
+from gpkit import Variable
+from fits import Fit, FitRegistry, max_affine_fit, load_table, get_fit
+
+def test_from_monomials():
+    fit = Fit.from_monomials([2., 3.], [[1.], [-1.]])
+    assert fit.evaluate([1., 3.]) == pytest.approx([3., 6.])
+
+def test_max_affine_recovers_monomials():
+    x = np.logspace(-1, 1, 41)
+    y = np.maximum(2*x, 3/x)
+    fit = max_affine_fit(np.log(x)[:, None], np.log(y), 2)
+    assert fit.rms < 1e-8
+    assert fit.evaluate(x) == pytest.approx(y)
+
+def test_registered_table_is_fitted_and_cached(tmp_path):
+    path = tmp_path/"cf.csv"
+    Re = np.logspace(5, 7, 9)
+    path.write_text("Re,Cf\n" + "".join("%.17g,%.17g\n" % (r, 0.074*r**-0.2)
+                                        for r in Re))
+    assert set(load_table(str(path))) == {"Re", "Cf"}
+    reg = FitRegistry(cachedir=str(tmp_path/"cache"))
+    reg.default("cf", Fit.from_monomials([1.], [[0.]]))
+    reg.register("cf", str(path), ["Re"], "Cf", K=1)
+    fit = reg.get("cf")
+    assert fit.evaluate(1e6) == pytest.approx(0.074*1e6**-0.2)
+    assert reg.get("cf") is fit
+    assert len(list((tmp_path/"cache").iterdir())) == 1
+
+def test_default_and_missing():
+    reg = FitRegistry()
+    with pytest.raises(KeyError):
+        reg.get("cf")
+    assert get_fit("wing_cf").K == 1
+
+def test_equality():
+    y, x = Variable("y"), Variable("x")
+    c, = get_fit("wing_cf").constraints(y, x, equality=True)
+    assert c.oper == "="
+    with pytest.raises(ValueError):
+        get_fit("tail_cd").constraints(y, x, x, equality=True)
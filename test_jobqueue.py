@@ -0,0 +1,44 @@
+" SQLite job queue: claiming, retries and reclaiming lost jobs "
+import time
+from jobqueue import JobQueue
+
+def _queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "jobs.db"), **kwargs)
+
+def test_claim_in_order_and_complete(tmp_path):
+    q = _queue(tmp_path)
+    a = q.enqueue("na", {"Srunway": 100}, "mass")
+    b = q.enqueue("blownwing", {"Srunway": 50})
+    assert q.claim("w1") == (a, "na", {"Srunway": 100}, "mass")
+    assert q.claim("w2") == (b, "blownwing", {"Srunway": 50}, "range")
+    assert q.claim("w3") is None
+    q.complete(a, "w1", {"outputs": {"R": 30.}})
+    assert q.counts() == {"done": 1, "running": 1}
+    assert list(q.results()) == [(a, "na", {"Srunway": 100},
+                                  {"outputs": {"R": 30.}})]
+    q.close()
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    q = _queue(tmp_path, max_attempts=2)
+    job = q.enqueue()
+    for _ in range(2):
+        assert q.claim("w1")[0] == job
+        q.fail(job, "w1", "UnknownInfeasible")
+    assert q.claim("w1") is None
+    assert q.counts() == {"failed": 1}
+    q.close()
+
+def test_reclaim_lost_worker(tmp_path):
+    q = _queue(tmp_path, stale=0.05)
+    job = q.enqueue()
+    assert q.claim("lost")[0] == job
+    assert q.claim("w2") is None
+    time.sleep(0.1)
+    # the heartbeat went stale, so another worker takes the job over
+    assert q.claim("w2")[0] == job
+    assert not q.beat(job, "lost")
+    assert q.beat(job, "w2")
+    # a late completion from the lost worker is ignored
+    q.complete(job, "lost", {"outputs": {}})
+    assert q.counts() == {"running": 1}
+    q.close()
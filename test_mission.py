@@ -0,0 +1,77 @@
+" Mission construction in threads, load cases and legs, and thermal solves "
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+from mission import Mission
+from diagnose import plainkey
+from solvers import get_solver
+
+def _value(v):
+    if callable(v):
+        return "linked"
+    if isinstance(v, np.ndarray) and v.dtype == object:
+        return tuple(_value(x) for x in v)
+    return repr(v)
+
+def _fingerprint(M):
+    " variables (by lineage name below the top model) and substitutions "
+    subs = sorted((plainkey(k), _value(v))
+                  for k, v in M.substitutions.items())
+    return sorted(plainkey(k) for k in M.vks), subs
+
+def build_in_threads(n=8, workers=4, wingmode="na"):
+    " n Missions built from a thread pool "
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(lambda _: Mission(wingmode=wingmode), range(n)))
+
+def test_threads():
+    " Missions built in threads have the same variables and values "
+    missions = build_in_threads()
+    first = _fingerprint(missions[0])
+    for M in missions[1:]:
+        assert _fingerprint(M) == first, "Missions built in threads differ"
+
+def test_threads_solve():
+    """ Missions built in threads solve to the same range
+
+    Only the builds run in parallel: gpkit's signomial solve also uses
+    global state, so they are solved in turn.
+    """
+    R = []
+    for M in build_in_threads(n=4):
+        M.cost = 1/M.R
+        sol = M.localsolve(get_solver(), verbosity=0)
+        R.append(sol(M.R).to("nmi").magnitude)
+    assert max(R) - min(R) <= 1e-4*R[0], "solutions differ: %s" % R
+
+@pytest.mark.parametrize("wingmode", ["blownwing", "na"])
+def test_thermal(wingmode):
+    " thermal Missions solve with every temperature rise under its cap "
+    M = Mission(wingmode=wingmode, thermal=True)
+    M.cost = 1/M.R
+    sol = M.localsolve(get_solver(), verbosity=0)
+    assert sol(M.R).to("nmi").magnitude > 1
+    T = M.thermal
+    for dT, cap in ((T.dT_m, T.dT_m_max), (T.dT_b, T.dT_b_max)):
+        rise = sol(dT).to("K").magnitude
+        assert (rise > 0).all()
+        assert (rise <= sol(cap).to("K").magnitude*(1 + 1e-4)).all()
+
+def test_load_cases_vectorized():
+    " extra load cases share one set of loading models, one entry per case "
+    M = Mission(wingmode="na", load_cases=[("gust", 6.5, 140),
+                                           ("landing", 3, None)])
+    loading = M.loading
+    assert loading.cases == {"gust": 0, "landing": 1}
+    wingl = loading.extra["wingl"]
+    assert wingl.q.shape == loading.wingl.q.shape + (2,)
+    Nmax = [f(M.substitutions) for f in wingl.substitutions[wingl.Nmax]]
+    assert Nmax == [6.5, 3]
+
+def test_legs_load_state():
+    " legged cruise loads the structure at the fastest leg's Vne "
+    M = Mission(wingmode="na", legs=3)
+    legs = M.cruise
+    M.substitutions[legs.flightstate.Vne] = [100, 120, 110]
+    Vne = legs.loadstate.substitutions[legs.loadstate.Vne](M.substitutions)
+    assert Vne.to("kts").magnitude == 120
@@ -0,0 +1,25 @@
+" cached Planform chord geometry "
+import numpy as np
+from planform import geometry
+
+def test_linear_taper():
+    " taper=1 matches the straight-taper chords 2/(1+lam)*(1+(lam-1)*eta) "
+    eta = tuple(np.linspace(0, 1, 7))
+    lam = 0.5
+    g = geometry(eta, lam)
+    assert np.allclose(g.cbar, 2/(1 + lam)*(1 + (lam - 1)*np.array(eta)))
+    assert np.allclose((g.cbave*g.deta).sum(), 1)
+
+def test_uses_given_nodes():
+    " the chord is evaluated at the nodes passed in, not a uniform grid "
+    eta = (0., 0.5, 0.8, 0.95, 1.)
+    g = geometry(eta, 0.4, 2.)
+    assert np.allclose(g.eta, eta)
+    assert np.allclose(g.deta, np.diff(eta))
+    c = 1 + (0.4 - 1)*np.array(eta)**2
+    assert np.allclose(g.cbar/g.cbar[0], c)
+
+def test_cached_readonly():
+    eta = tuple(np.linspace(0, 1, 5))
+    assert geometry(eta, 0.5) is geometry(eta, 0.5)
+    assert not geometry(eta, 0.5).cbar.flags.writeable
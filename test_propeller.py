@@ -0,0 +1,41 @@
+" propeller map fits and their use in the Mission "
+import os
+import numpy as np
+import pytest
+import propeller
+from fits import FitRegistry, get_fit, load_table
+from mission import Mission
+
+MAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "propmap.csv")
+
+def efficiency(J, M_tip):
+    " J*C_T/C_P from the registered fits "
+    return J/get_fit("prop_ct").evaluate(J, M_tip)/get_fit(
+        "prop_cp").evaluate(J, M_tip)
+
+def test_defaults_fit_sample_map(tmp_path, monkeypatch):
+    " the built-in coefficients are propmap.csv's fits "
+    table = load_table(MAP)
+    J, M_tip = table["J"], table["M_tip"]
+    reg = FitRegistry(cachedir=str(tmp_path))
+    monkeypatch.setattr(propeller, "registry", reg)
+    propeller.load_map(MAP)
+    for name in ("prop_ct", "prop_cp"):
+        assert reg.get(name).evaluate(J, M_tip) == pytest.approx(
+            get_fit(name).evaluate(J, M_tip), rel=1e-4)
+
+def test_efficiency_peak():
+    " the sample fixed-pitch propeller peaks near J = 0.6 "
+    J = np.linspace(0.1, 1, 10)
+    eta = efficiency(J, np.full(10, 0.4))
+    assert J[eta.argmax()] == pytest.approx(0.6)
+    assert 0.6 < eta.max() < 0.85
+    assert eta[0] < 0.3
+
+def test_mission_uses_map():
+    " with propmap every segment has a propeller model and a free eta_prop "
+    M = Mission(wingmode="blownwing", propmap=True)
+    for seg in (M.takeoff, M.obstacle_climb, M.climb, M.cruise, M.landing):
+        perf = seg.perf.bw_perf
+        assert hasattr(perf, "prop_perf")
+        assert perf.eta_prop.key not in M.substitutions
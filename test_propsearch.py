@@ -0,0 +1,23 @@
+" cheap bounds of the propeller-count search "
+from propsearch import span_feasible, center_out, dominated, search, SPAN
+
+def test_span_feasible():
+    # 50 in of fuselage plus n discs of 0.1 m radius, in a 20 ft span
+    assert span_feasible(10, 20.)
+    assert not span_feasible(30, 20.)
+
+def test_search_prunes_by_span():
+    " counts that cannot fit in a fixed span are never solved "
+    n_best, sol, report = search(range(30, 40, 2),
+                                 substitutions={SPAN: 20.})
+    assert n_best is None and sol is None
+    assert set(report) == set(range(30, 40, 2))
+    assert all(r["status"] == "pruned: span" for r in report.values())
+
+def test_center_out():
+    assert center_out(range(2, 17, 2)) == [8, 6, 10, 4, 12, 2, 14, 16]
+
+def test_dominated():
+    done = {6: 4.9, 8: 5., 10: 6.}
+    assert dominated(14, done)
+    assert not dominated(4, done)
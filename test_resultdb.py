@@ -0,0 +1,33 @@
+" result database round trip and indexed queries "
+import pytest
+from resultdb import ResultDB
+
+def _record(R, mass, Srunway):
+    return {"inputs": {"Srunway": Srunway}, "status": "solved", "time": 1.,
+            "outputs": {"R": R, "mass": mass, "battery_m": 200.,
+                        "Srunway": Srunway}}
+
+def test_round_trip(tmp_path):
+    db = ResultDB(str(tmp_path / "results.db"))
+    run = db.add_record(_record(30., 700., 100.), "na", "range",
+                        variables={"R": [30., "nmi"]},
+                        sensitivities={"Srunway": [-0.2, "m"]})
+    row, = db.find("na")
+    assert row["id"] == run and row["cost"] == "range"
+    assert row["R"] == 30. and row["inputs"] == {"Srunway": 100.}
+    assert db.variables(run) == {"R": [30., "nmi"]}
+    assert db.sensitivities(run) == {"Srunway": [-0.2, "m"]}
+    db.close()
+
+def test_find_ranges(tmp_path):
+    db = ResultDB(str(tmp_path / "results.db"))
+    ids = [db.add_record(_record(R, 700., S), "blownwing")
+           for R, S in [(20., 50.), (40., 50.), (60., 150.)]]
+    db.add_record(_record(80., 700., 50.), "na")
+    assert [r["id"] for r in db.find("blownwing", R=(30, None))] == ids[1:]
+    assert [r["id"] for r in db.find("blownwing", R=(30, None),
+                                     Srunway=(None, 100))] == [ids[1]]
+    assert db.variables(ids[0]) is None
+    with pytest.raises(KeyError):
+        db.find(R=(0, 1), span=(0, 1))
+    db.close()
@@ -0,0 +1,28 @@
+" crash recovery of the NDJSON result sink "
+import os
+from resultsink import NDJSONSink, iter_records, read_case, load_index
+
+def _torn_sink(path, drop_index):
+    with NDJSONSink(path) as sink:
+        sink.write(0, {"status": "solved"})
+        sink.write(1, {"status": "solved"})
+    with open(path, "ab") as f:
+        f.write(b'{"status": "sol')
+    if drop_index:
+        os.remove(path + ".idx")
+    with NDJSONSink(path) as sink:
+        sink.write(2, {"status": "solved"})
+
+def test_torn_tail(tmp_path):
+    path = str(tmp_path / "sweep.ndjson")
+    _torn_sink(path, drop_index=False)
+    assert [r["id"] for r in iter_records(path)] == [0, 1, 2]
+    assert read_case(path, 2)["id"] == 2
+    assert read_case(path, 1)["id"] == 1
+
+def test_torn_tail_without_index(tmp_path):
+    path = str(tmp_path / "sweep.ndjson")
+    _torn_sink(path, drop_index=True)
+    assert sorted(load_index(path)) == ["0", "1", "2"]
+    assert [r["id"] for r in iter_records(path)] == [0, 1, 2]
+    assert read_case(path, 2)["id"] == 2
@@ -0,0 +1,26 @@
+" memory-mapped store built from an NDJSON sink "
+import numpy as np
+import pytest
+from resultsink import NDJSONSink
+from resultstore import ArrayStore, from_ndjson
+
+def test_from_ndjson(tmp_path):
+    path = str(tmp_path / "sweep.ndjson")
+    with NDJSONSink(path) as sink:
+        sink.write(0, {"inputs": {"Srunway": 50}, "outputs": {"R": 20.},
+                       "status": "solved"})
+        sink.write(1, {"inputs": {"Srunway": 100}, "outputs": {},
+                       "status": "UnknownInfeasible"})
+    store = from_ndjson(path, str(tmp_path / "sweep.dat"))
+    assert list(store["id"]) == [0, 1]
+    assert list(store["Srunway"]) == [50, 100]
+    assert store["R"][0] == 20. and np.isnan(store["R"][1])
+    assert store.units("R") == "nmi"
+    reader = ArrayStore(str(tmp_path / "sweep.dat"))
+    assert list(reader["Srunway"]) == [50, 100]
+
+def test_empty_sink(tmp_path):
+    path = str(tmp_path / "empty.ndjson")
+    NDJSONSink(path).close()
+    with pytest.raises(ValueError):
+        from_ndjson(path, str(tmp_path / "empty.dat"))
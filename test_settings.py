@@ -0,0 +1,38 @@
+" named model settings: names, units, layering and model paths "
+import json
+import pytest
+import settings
+from settings import SETTINGS, ALIASES, canonical, quantity, load
+
+def test_aliases_and_unknown_names():
+    for alias, name in ALIASES.items():
+        assert canonical(alias) == name
+    with pytest.raises(KeyError):
+        canonical("wingspan")
+
+def test_quantity_units():
+    assert quantity("Vstall", 61).to("kts").magnitude == 61
+    assert quantity("battery_Estar", "0.25 kWh/kg").magnitude == \
+        pytest.approx(250)
+    assert quantity("tau", "0.1").magnitude == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        quantity("mpax", "86 m")
+
+def test_load_layers(tmp_path):
+    site = tmp_path / "site.json"
+    site.write_text(json.dumps({"n_prop": "10", "mpax": 86,
+                                "solver": "fastest", "_note": "skipped"}))
+    values = load(str(site), {"n_prop": 8, "E_Star": "300"})
+    assert sorted(values) == ["battery_Estar", "mpax", "n_prop"]
+    assert values["n_prop"].magnitude == 8
+    assert values["battery_Estar"].to("Wh/kg").magnitude == 300
+
+@pytest.mark.parametrize("wingmode", ["blownwing", "na"])
+def test_every_setting_resolves(wingmode):
+    " each setting's paths name variables of a built Mission, in its units "
+    M = settings.template(wingmode)
+    for name, (_, paths) in SETTINGS.items():
+        variables = settings.variables(M, name)
+        assert len(variables) == len(paths)
+        for v in variables:
+            assert quantity(name, 1).to(v.key.units or "dimensionless")
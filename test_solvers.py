@@ -0,0 +1,38 @@
+" budgeted solves on a small signomial program "
+import pytest
+from gpkit import Variable, Model, SignomialsEnabled
+from gpkit.exceptions import Infeasible
+from solvers import timed_solve
+
+def toy():
+    " x >= 1 - y with y <= 0.1, so x = 0.9 "
+    x = Variable("x")
+    y = Variable("y")
+    with SignomialsEnabled():
+        return x, Model(x, [x >= 1 - y, y <= 0.1])
+
+def test_converges():
+    x, M = toy()
+    sol, converged = timed_solve(M)
+    assert converged
+    assert sol(x).magnitude == pytest.approx(0.9, rel=1e-4)
+
+def test_budget_spent():
+    " with no time left the first localsolve is the last "
+    x, M = toy()
+    sol, converged = timed_solve(M, budget=1e-9)
+    assert not converged
+    assert sol(x).magnitude >= 0.9*(1 - 1e-4)
+
+def test_iteration_limit():
+    _, M = toy()
+    _, converged = timed_solve(M, iteration_limit=2, reltol=0)
+    assert not converged
+    assert len(M.program.gps) == 2
+
+def test_slack_at_deadline_raises():
+    " a last localsolve that still needs signomial slack is not accepted "
+    x, M = toy()
+    M = Model(x, [M, x <= 0.5])
+    with pytest.raises(Infeasible):
+        timed_solve(M, budget=1e-9)
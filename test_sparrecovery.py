@@ -0,0 +1,32 @@
+" dense spanwise recovery of a solved spar "
+from types import SimpleNamespace as NS
+import numpy as np
+import pytest
+from gpkit import ureg
+from sparrecovery import cumtrapz, segments, recover
+
+def test_cumtrapz():
+    x = np.linspace(0, 2, 5)
+    assert cumtrapz(2*x, x) == pytest.approx(x**2)
+    assert cumtrapz(np.ones(5), x, reverse=True) == pytest.approx(2 - x)
+
+def test_segments():
+    eta_nodes = np.array([0, 0.5, 1])
+    assert list(segments([1, 2], [0, 0.25, 0.5, 0.75, 1], eta_nodes)) \
+        == [1, 1, 2, 2, 2]
+
+def test_uniform_cantilever():
+    " a uniformly loaded constant spar matches the closed-form cantilever "
+    q, L, E, I = 100., 2., 7e10, 1e-6
+    spar = NS(material=NS(E="E"), I="I", Sy="Sy", w="w", t="t")
+    wing = NS(spar=spar, planform=NS(b="b", eta="eta"))
+    loading = NS(wing=wing, q="q")
+    values = {"b": 2*L*ureg.m, "eta": np.linspace(0, 1, 5)*ureg.dimensionless,
+              "q": np.full(5, q)*ureg("N/m"), "E": E*ureg.Pa,
+              "I": np.full(4, I)*ureg("m^4"), "Sy": np.full(4, 1e-5)*ureg("m^3"),
+              "w": np.full(4, 0.01)*ureg.m, "t": np.full(4, 0.001)*ureg.m}
+    out = recover(values.__getitem__, loading, n=2001)
+    assert out["S"][0] == pytest.approx(q*L)
+    assert out["M"][0] == pytest.approx(q*L**2/2, rel=1e-6)
+    assert out["w"][-1] == pytest.approx(q*L**4/(8*E*I), rel=1e-5)
+    assert out["sigma"][0] == pytest.approx(q*L**2/2/1e-5, rel=1e-6)
@@ -2,6 +2,8 @@ import gpkit
 from gpkit import Model, parse_variables, Vectorize, SignomialEquality,Variable,units
 from battm import *
 from wing_struct import Planform,WingSkin,CapSpar
+from fits import get_fit
+from propeller import Propeller
 import math
 import numpy as np
 pi = math.pi 
@@ -33,10 +35,10 @@ class Wing(Model):
     fillModel = False
     skinModel = WingSkin
     @parse_variables(__doc__,globals())
-    def setup(self, N=4):
+    def setup(self, N=4, taper=1.):
         self.N = N
 
-        self.planform = Planform(N)
+        self.planform = Planform(N, taper)
         self.b = self.planform.b
         self.components = []
 
@@ -66,17 +68,25 @@ class NormalWing(Model):
     n_prop    1     [-]             number of powertrains/propellers
     m               [kg]            mass
     """
+    propModel = None
     @parse_variables(__doc__,globals())
-    def setup(self):
-
-        self.powertrain = Powertrain()
+    def setup(self,propmap=False,taper=1.,motors=None):
+        #propmap=True takes eta_prop from the propeller map (propeller.py)
+        #taper is the chord distribution exponent (see planform.geometry)
+        #motors is the motor catalogue table, None for the built-in fits
+        if propmap:
+            self.propModel = Propeller
+        self.powertrain = Powertrain(motors)
         N =14
-        self.wing = Wing(N)
+        self.wing = Wing(N,taper)
         self.wing.substitutions[self.wing.planform.tau]=0.12
         self.wing.substitutions[self.wing.planform.lam]=1
         constraints = [
             m >= self.powertrain["m"] + self.wing.W/2.02462*units('kg/lbf')#("W")/g,
         ]
+        if self.propModel:
+            self.prop = self.propModel(self.powertrain)
+            constraints += [self.prop]
         return constraints,self.powertrain,self.wing
     def dynamic(self,state,wingmode="na"):
         return NormalWingP(self,state)
@@ -121,7 +131,7 @@ class NormalWingP(Model):
                C_L <= CLmax,
                C_Di*(pi*bw.wing["AR"]*e ) >= (C_L**2),
                C_D >= C_Di  + C_Dp,
-               C_f**5 == (mfac*0.074)**5 /(Re),
+               get_fit("wing_cf").constraints(C_f/mfac, Re, equality=True),
                C_Dp == C_f*2.1*Kf,
                Re == state["V"]*state["rho"]*(bw.wing["S"]/bw.wing["AR"])**0.5/state["mu"],
                
@@ -131,6 +141,9 @@ class NormalWingP(Model):
                P <= bw.n_prop * bw.powertrain["Pmax"],
                T >= 0.5 * state.rho * bw.wing["S"] * state.V**2 * C_D,
                ]
+        if bw.propModel:
+            self.prop_perf = bw.prop.dynamic(state, T, P, bw.n_prop, eta_prop)
+            constraints += [self.prop_perf]
             
         return constraints
     
@@ -142,20 +155,26 @@ class BlownWing(Model):
     n_prop     10   [-]             number of powertrains/propellers
     m               [kg]            mass
     """
+    propModel = None
     @parse_variables(__doc__,globals())
-    def setup(self,seg="cruise"):
-        self.powertrain = Powertrain()
+    def setup(self,seg="cruise",propmap=False,taper=1.,motors=None):
+        if propmap:
+            self.propModel = Propeller
+        self.powertrain = Powertrain(motors)
         N = 14
-        self.wing = Wing(N)
+        self.wing = Wing(N,taper)
         self.wing.substitutions[self.wing.planform.tau]=0.12
         self.wing.substitutions[self.wing.planform.lam]=1
         
         constraints = [
             m >= n_prop*self.powertrain["m"] + self.wing.W/2.02462*units('kg/lbf')#("W")/g,
         ]
+        if self.propModel:
+            self.prop = self.propModel(self.powertrain)
+            constraints += [self.prop]
         return constraints,self.powertrain,self.wing
-    def dynamic(self,state,seg =False):
-        return BlownWingP(self,state,seg=seg)
+    def dynamic(self,state,n_active=None):
+        return BlownWingP(self,state,n_active=n_active)
 
 class BlownWingP(Model):
     #Built from Mark Drela's Powered-Lift and Drag Calculation
@@ -194,14 +213,24 @@ class BlownWingP(Model):
     CLCmax    3.5   [-]             clc max
     """
     @parse_variables(__doc__,globals())
-    def setup(self,bw,state,seg):
+    def setup(self,bw,state,n_active=None):
         #bw is a BlownWing object
         #state is a FlightState
-        n_active = 2 if seg else bw["n_prop"]
+        #n_active is the number of propellers driving this segment, or a
+        #list of them in a vectorized segment; None means all n_prop
+        if n_active is None and Vectorize.vectorization:
+            n_active = [None]*Vectorize.vectorization[0]
+        if n_active is None:
+            n_active = lambda c: c[bw.n_prop]
+        elif not np.isscalar(n_active) and any(n is None for n in n_active):
+            counts = list(n_active)
+            n_active = lambda c: [c[bw.n_prop] if n is None else n
+                                  for n in counts]
+        n_active = self.n_active = Variable("n_{active}", n_active, "-",
+                                            "number of active propellers")
         with gpkit.SignomialsEnabled():
             constraints = [
             A_disk == n_active*pi*bw.powertrain.r**2,
-            ((P*eta_prop*bw.powertrain.eta)/(0.5*T*state["V"]) - 1)**2 >= (T/(A_disk*(state.V**2)*state.rho/2)+1),
             (u_j/state.V)**2 <= (T/(A_disk*(state.V**2)*state.rho/2) + 1),
             u_j >= state.V,
             P <= n_active*bw.powertrain["Pmax"],
@@ -220,8 +249,18 @@ class BlownWingP(Model):
             h == pi*bw.powertrain.r/2,
             C_Di*(pi*bw.wing["AR"]*e + 2*C_J) >= (C_L**2),
             C_D >= C_Di  + C_Dp,
-            C_f**5 == (mfac*0.074)**5 /(Re),
+            get_fit("wing_cf").constraints(C_f/mfac, Re, equality=True),
             C_Dp == C_f*2.1*Kf,
             Re == state["V"]*state["rho"]*(bw.wing["S"]/bw.wing["AR"])**0.5/state["mu"],
             ]
+            if bw.propModel:
+                # the map efficiency already includes the induced loss, so
+                # it replaces the actuator-disk power relation
+                constraints += [P*eta_prop*bw.powertrain.eta >= T*state.V]
+            else:
+                # eta_prop is the loss after the ideal actuator disk
+                constraints += [((P*eta_prop*bw.powertrain.eta)/(0.5*T*state["V"]) - 1)**2 >= (T/(A_disk*(state.V**2)*state.rho/2)+1)]
+        if bw.propModel:
+            self.prop_perf = bw.prop.dynamic(state, T, P, n_active, eta_prop)
+            constraints += [self.prop_perf]
         return constraints
\ No newline at end of file
@@ -4,6 +4,8 @@ from gpkit import Model, parse_variables,units
 from gpkitmodels.GP.materials import cfrpud, cfrpfabric, foamhd
 from gpkitmodels import g
 from numpy import pi
+from planform import geometry
+from beam import column
 
 
 class Planform(Model):
@@ -52,29 +54,23 @@ class Planform(Model):
     cbarmac     \\bar{c}_{\\mathrm{MAC}}
 
     """
-    def return_c(self, c):
-        " return normalized chord distribution "
+    def return_geometry(self, c):
+        " cached chord geometry for the substituted nodes and taper ratio "
         lam = c(self.lam).to("dimensionless").magnitude
         eta = c(self.eta).to("dimensionless").magnitude
-        return np.array([2./(1+lam)*(1+(lam-1)*e) for e in eta])
-
-    def return_cmac(self, c):
-        " return normalized MAC "
-        cbar = self.return_c(c)
-        lam = cbar[1:]/cbar[:-1]
-        maci = 2./3*cbar[:-1]*(1 + lam + lam**2)/(1 + lam)
-        deta = np.diff(c(self.eta).to("dimensionless").magnitude) 
-        num = sum([(cbar[i] + cbar[i+1])/2*maci[i]*deta[i] for i
-                   in range(len(deta))])
-        den = sum([(cbar[i] + cbar[i+1])/2*deta[i] for i in range(len(deta))])
-        return num/den/cbar[0]
-
-    return_avg = lambda self, c: (self.return_c(c)[:-1]
-                                  + self.return_c(c)[1:])/2.
-    return_deta = lambda self, c: np.diff(c(self.eta).to("dimensionless").magnitude)
+        return geometry(tuple(float(e) for e in eta), float(lam), self.taper)
+
+    return_c = lambda self, c: self.return_geometry(c).cbar
+    return_cmac = lambda self, c: self.return_geometry(c).cbarmac
+    return_avg = lambda self, c: self.return_geometry(c).cbave
+    return_deta = lambda self, c: self.return_geometry(c).deta
 
     @parse_variables(__doc__, globals())
-    def setup(self, N):
+    def setup(self, N, taper=1.):
+        self.N = N
+        # exponent of the spanwise chord distribution, 1 for linear taper;
+        # see planform.geometry
+        self.taper = taper
         return [b**2 == S*AR,
                 cave == cbave*S/b,
                 croot == S/b*cbar[0],
@@ -140,6 +136,9 @@ class SparLoading(Model):
         E = self.wing.spar.material.E
         sigma = self.wing.spar.material.sigma
         deta = self.wing.planform.deta
+        # the wing's arrays broadcast over the load cases of a vectorized
+        # loading
+        I, Sy, cave, cbar, deta = map(column, (I, Sy, cave, cbar, deta))
 
         constraints = []
         if not out:
@@ -160,6 +159,7 @@ class SparLoading(Model):
         if self.wingSparJ:
             qne = self.qne = state.qne
             J = self.J = self.wing.spar.J
+            J = column(J)
             G = self.wing.spar.shearMaterial.G
             cm = self.wing.planform.CM
             constraints.extend([
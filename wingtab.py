@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import numpy as np
+from sparrecovery import recover
 
 class WingDesignTab(QWidget):
     def __init__(self):
@@ -75,19 +76,16 @@ class WingDesignTab(QWidget):
 
     def prepare_plot_data(self):
         try:
-            wing = self.mission.aircraft.bw.wing
-            sol = self.solution
-            M = self.mission
-            span = sol(wing.planform.b).to("m").magnitude
-            x = np.linspace(0, 1, len(sol(M.loading.wingl.w).magnitude)) * span / 2
+            # dense spanwise output re-integrated from the sized spar
+            dense = recover(self.solution, self.mission.loading.wingl)
 
             self.plot_data = {
-                "x": x,
-                "w_defl": sol(M.loading.wingl.w).to("m").magnitude,
-                "M_bend": sol(M.loading.wingl.M).to("N*m").magnitude,
-                "I_beam": sol(wing.spar["I"]).to("m^4").magnitude,
-                "q_dist": sol(M.loading.wingl.q).to("N/m").magnitude,
-                "Sy": sol(wing.spar["Sy"]).to("m^3").magnitude,
+                "x": dense["x"],
+                "w_defl": dense["w"],
+                "M_bend": dense["M"],
+                "I_beam": dense["I"],
+                "q_dist": dense["q"],
+                "Sy": dense["Sy"],
             }
 
         except Exception as e: